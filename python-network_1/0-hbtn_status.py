@@ -2,17 +2,20 @@
 """Fetches the URL: https://intranet.hbtn.io/status
 """
 
-from urllib.request import Request, urlopen
+from http_pool import request
 
 
-if __name__ == "__main__":
-    req = Request('https://intranet.hbtn.io/status')
+def fetch_status(url='https://intranet.hbtn.io/status', pool=None):
+    """Returns the raw body of `url`, reusing a pooled connection"""
+    with request('GET', url, pool=pool) as res:
+        return res.read()
+
 
-    with urlopen(req) as res:
-        content = res.read()
-        utf8_content = content.decode('utf-8')
+if __name__ == "__main__":
+    content = fetch_status()
+    utf8_content = content.decode('utf-8')
 
-        print('Body response:')
-        print('\t- type: {_type}'.format(_type=type(content)))
-        print('\t- content: {_content}'.format(_content=content))
-        print('\t- utf8 content: {_utf8_c}'.format(_utf8_c=utf8_content))
+    print('Body response:')
+    print('\t- type: {_type}'.format(_type=type(content)))
+    print('\t- content: {_content}'.format(_content=content))
+    print('\t- utf8 content: {_utf8_c}'.format(_utf8_c=utf8_content))
@@ -5,12 +5,15 @@ variable found in the header of the response.
 """
 
 from sys import argv
-from urllib.request import Request, urlopen
+from http_pool import request
 
 
-if __name__ == "__main__":
-    req = Request(argv[1])
+def get_request_id(url, pool=None):
+    """Returns the `X-Request-Id` header of the response from `url`"""
+    with request('GET', url, pool=pool) as res:
+        res.read()
+        return res.headers.get('X-Request-Id')
+
 
-    with urlopen(req) as res:
-        headers = res.info()
-        print(headers.get('X-Request-Id'))
+if __name__ == "__main__":
+    print(get_request_id(argv[1]))
@@ -1,14 +1,174 @@
 #!/usr/bin/python3
 """Takes my Github credentials (username and password)
 and uses the Github API to display my Github id.
+
+Batch mode looks up many credentials at once:
+    ./10-my_github.py --batch FILE [--workers N] [--cache DIR]
+FILE holds one `username token` pair per line. Results are cached on
+disk and revalidated with `If-None-Match`, and requests wait for the
+rate limit window to reset when GitHub reports it as exhausted.
+Set GITHUB_API_URL to point the script at a mock server.
 """
 
-from sys import argv
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 import requests
 
+API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'my_github')
+
+_local = threading.local()
+
+
+def get_session():
+    """Returns this thread's requests session"""
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def parse_retry_after(value):
+    """Returns the seconds a Retry-After header asks for, or None.
+    The header is either a number of seconds or an HTTP date.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0, when.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Tracks the X-RateLimit-* headers seen for each credential and
+    makes callers wait for the reset time once none are left.
+    """
+
+    def __init__(self):
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def wait(self, username):
+        with self._lock:
+            remaining, reset = self._limits.get(username, (1, 0))
+        if remaining <= 0 and reset > time.time():
+            time.sleep(reset - time.time())
+
+    def update(self, username, headers):
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            with self._lock:
+                self._limits[username] = (int(remaining), int(reset))
+
+    def backoff(self, username, headers):
+        """Returns seconds to wait before retrying a 403/429, or None"""
+        delay = parse_retry_after(headers.get('Retry-After'))
+        if delay is not None:
+            return delay
+        self.update(username, headers)
+        with self._lock:
+            remaining, reset = self._limits.get(username, (1, 0))
+        if remaining <= 0:
+            return max(0, reset - time.time())
+        return None
+
+
+def cache_path(cache_dir, username, token):
+    """Cache file for a credential; the token itself is never stored"""
+    key = hashlib.sha256('{}:{}'.format(username, token).encode()).hexdigest()
+    return os.path.join(cache_dir, key + '.json')
+
+
+def get_github_id(username, token, api_url=API_URL, cache_dir=None,
+                  limiter=None):
+    """Returns the Github id for a credential, or None"""
+    cached = {}
+    path = cache_path(cache_dir, username, token) if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path) as f:
+            cached = json.load(f)
+
+    headers = {'Accept': 'application/vnd.github+json'}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+
+    for _ in range(3):
+        if limiter:
+            limiter.wait(username)
+        res = get_session().get(api_url + '/user', auth=(username, token),
+                                headers=headers, timeout=10)
+        if limiter and res.status_code in (403, 429):
+            delay = limiter.backoff(username, res.headers)
+            if delay is not None:
+                time.sleep(delay)
+                continue
+        break
+
+    if limiter:
+        limiter.update(username, res.headers)
+    if res.status_code == 304:
+        return cached.get('id')
+    if res.status_code != 200:
+        return None
+
+    user_id = res.json().get('id')
+    if path and res.headers.get('ETag'):
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'etag': res.headers['ETag'], 'id': user_id}, f)
+    return user_id
+
+
+def read_credentials(filename):
+    """Reads `username token` pairs, one per line"""
+    with open(filename) as f:
+        return [tuple(line.split()[:2]) for line in f
+                if len(line.split()) >= 2]
+
+
+def batch_lookup(credentials, workers=8, api_url=API_URL,
+                 cache_dir=CACHE_DIR):
+    """Looks up every (username, token) concurrently.
+
+    Returns:
+        list: (username, id) in input order
+    """
+    limiter = RateLimiter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        ids = pool.map(lambda cred: get_github_id(cred[0], cred[1], api_url,
+                                                  cache_dir, limiter),
+                       credentials)
+        return list(zip((cred[0] for cred in credentials), ids))
+
 
 if __name__ == "__main__":
-    url = 'https://api.github.com/user'
-    req = requests.get(url, auth=(argv[1], argv[2])).json()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('username', nargs='?')
+    parser.add_argument('password', nargs='?')
+    parser.add_argument('--batch', metavar='FILE')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--cache', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    if args.batch:
+        for username, user_id in batch_lookup(read_credentials(args.batch),
+                                              args.workers,
+                                              cache_dir=args.cache):
+            print(username, user_id)
+    else:
+        url = API_URL + '/user'
+        req = requests.get(url, auth=(args.username, args.password)).json()
 
-    print(req.get('id'))
+        print(req.get('id'))
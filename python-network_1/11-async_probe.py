@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""Probes many URLs concurrently with asyncio and reports, for each one,
+the status code and the `X-Request-Id` header, followed by latency
+percentiles over all the responses.
+
+Usage: ./11-async_probe.py [-c CONCURRENCY] [-t TIMEOUT] [-f FILE] [URL ...]
+"""
+
+import argparse
+import asyncio
+import ssl
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+async def fetch_head(url):
+    """Sends a GET request and reads the status line and headers only.
+
+    Returns:
+        tuple: (status_code, headers dict with lower-case names)
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port,
+        ssl=ssl.create_default_context() if secure else None)
+    try:
+        writer.write((
+            'GET {} HTTP/1.1\r\n'
+            'Host: {}\r\n'
+            'User-Agent: async-probe\r\n'
+            'Connection: close\r\n\r\n'
+        ).format(path, parts.netloc).encode('ascii'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+    finally:
+        writer.close()
+
+
+async def probe(url, semaphore, timeout):
+    """Probes one URL, never raising.
+
+    Returns:
+        dict: url, status, request_id, latency (seconds) and error
+    """
+    result = {'url': url, 'status': None, 'request_id': None,
+              'latency': None, 'error': None}
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            status, headers = await asyncio.wait_for(fetch_head(url),
+                                                     timeout)
+        except asyncio.TimeoutError:
+            result['error'] = 'timeout'
+        except (OSError, ValueError, IndexError) as ex:
+            result['error'] = str(ex) or type(ex).__name__
+        else:
+            result['status'] = status
+            result['request_id'] = headers.get('x-request-id')
+            result['latency'] = time.perf_counter() - start
+    return result
+
+
+async def probe_all(urls, concurrency=50, timeout=5.0):
+    """Probes all URLs, with at most `concurrency` requests in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(probe(url, semaphore, timeout)
+                                  for url in urls))
+
+
+def percentile(sorted_values, pct):
+    """Returns the pct-th percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Concurrent HTTP probe')
+    parser.add_argument('urls', nargs='*')
+    parser.add_argument('-c', '--concurrency', type=int, default=50)
+    parser.add_argument('-t', '--timeout', type=float, default=5.0)
+    parser.add_argument('-f', '--file', help='file with one URL per line')
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.file:
+        with open(args.file) as f:
+            urls += [line.strip() for line in f if line.strip()]
+    if not urls:
+        parser.error('no URLs given')
+
+    results = asyncio.run(probe_all(urls, args.concurrency, args.timeout))
+    for r in results:
+        if r['error']:
+            print('{url}\tERROR\t{error}'.format(**r))
+        else:
+            print('{url}\t{status}\t{request_id}\t{ms:.1f} ms'.format(
+                ms=r['latency'] * 1000, **r))
+
+    latencies = sorted(r['latency'] for r in results if r['latency'])
+    if latencies:
+        print('{} ok, {} failed; p50 {:.1f} ms, p90 {:.1f} ms, '
+              'p99 {:.1f} ms'.format(
+                  len(latencies), len(results) - len(latencies),
+                  percentile(latencies, 50) * 1000,
+                  percentile(latencies, 90) * 1000,
+                  percentile(latencies, 99) * 1000))
+    else:
+        print('0 ok, {} failed'.format(len(results)))
+        sys.exit(1)
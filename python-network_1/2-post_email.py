@@ -5,15 +5,20 @@ displays the body of the response (decoded in utf-8).
 """
 
 from sys import argv
-from urllib.request import Request, urlopen
 from urllib.parse import urlencode
+from http_pool import request
 
 
-if __name__ == "__main__":
+def post_email(url, email, pool=None):
+    """POSTs `email` to `url` and returns the decoded response body"""
     data = urlencode({
-                        'email': argv[2]
+                        'email': email
                     }).encode('ascii')
-    req = Request(argv[1], data)
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+    with request('POST', url, data, headers, pool=pool) as res:
+        return res.read().decode('utf-8')
 
-    with urlopen(req) as res:
-        print(res.read().decode('utf-8'))
+
+if __name__ == "__main__":
+    print(post_email(argv[1], argv[2]))
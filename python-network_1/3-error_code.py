@@ -2,21 +2,24 @@
 """Takes in a URL, sends a request to the URL and
 displays the body of the response (decoded in utf-8).
 
-In addition, it handles HTTPError exceptions to print
+In addition, it handles HTTP errors to print
 the HTTP Status Code, if an error occurs.
 """
 
 from sys import argv
-from urllib.request import Request, urlopen
-from urllib.parse import urlencode
-from urllib.error import HTTPError
+from http_pool import request
+
+
+def fetch_body(url, pool=None):
+    """Returns (status code, decoded body) of the response from `url`"""
+    with request('GET', url, pool=pool) as res:
+        return res.status, res.read().decode('utf-8')
 
 
 if __name__ == "__main__":
-    req = Request(argv[1])
+    status, body = fetch_body(argv[1])
 
-    try:
-        with urlopen(req) as res:
-            print(res.read().decode('utf-8'))
-    except HTTPError as ex:
-        print('Error code:', ex.code)
+    if status >= 400:
+        print('Error code:', status)
+    else:
+        print(body)
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Small HTTP client on top of `http.client` that keeps connections
+alive and reuses them for later requests to the same host, decodes
+gzip bodies and can stream a response in chunks.
+
+Usage:
+    from http_pool import request
+    with request('GET', 'https://intranet.hbtn.io/status') as res:
+        body = res.read()
+"""
+
+import http.client
+import threading
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+
+class Response:
+    """A response whose connection goes back to the pool once the body
+    has been read or the response is closed.
+    """
+
+    def __init__(self, pool, key, conn, raw):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._raw = raw
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+        gzipped = raw.getheader('Content-Encoding', '').lower() == 'gzip'
+        # 16 + MAX_WBITS makes zlib expect a gzip header
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) \
+            if gzipped else None
+
+    def iter_content(self, chunk_size=64 * 1024):
+        """Yields the (decoded) body in chunks, then releases the
+        connection.
+        """
+        try:
+            while True:
+                chunk = self._raw.read(chunk_size)
+                if not chunk:
+                    break
+                if self._decoder:
+                    chunk = self._decoder.decompress(chunk)
+                if chunk:
+                    yield chunk
+            if self._decoder:
+                tail = self._decoder.flush()
+                if tail:
+                    yield tail
+        finally:
+            self.close()
+
+    def read(self):
+        """Returns the whole (decoded) body as bytes."""
+        return b''.join(self.iter_content())
+
+    def close(self):
+        """Releases the connection: back to the pool if the body was
+        fully read and the server allows reuse, closed otherwise.
+        """
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        if self._raw.isclosed() and not self._raw.will_close:
+            self._pool._release(self._key, conn)
+        else:
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+class ConnectionPool:
+    """Keeps up to `maxsize` idle connections per (scheme, host, port)."""
+
+    def __init__(self, maxsize=4, timeout=10, max_redirects=5):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, key):
+        scheme, host, port = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port,
+                                               timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, url, body=None, headers=None):
+        """Sends a request, reusing an idle connection when possible.
+        Redirects are followed like urllib does.
+
+        Returns:
+            Response: read it, iterate it or close it to free the
+            connection
+        """
+        for _ in range(self.max_redirects):
+            res = self._send(method, url, body, headers)
+            location = res.headers.get('Location')
+            if res.status not in REDIRECT_CODES or not location:
+                return res
+            res.read()
+            url = urljoin(url, location)
+            if res.status == 303 or (res.status in (301, 302) and
+                                     method == 'POST'):
+                method, body = 'GET', None
+        return self._send(method, url, body, headers)
+
+    def _send(self, method, url, body, headers):
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        headers = dict(headers or {})
+        headers.setdefault('Accept-Encoding', 'gzip')
+        headers.setdefault('Connection', 'keep-alive')
+
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                raw = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                if reused:
+                    # the server dropped an idle connection, try a new one
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            return Response(self, key, conn, raw)
+
+    def close(self):
+        """Closes every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+default_pool = ConnectionPool()
+
+
+def request(method, url, body=None, headers=None, pool=None):
+    """Sends a request through `pool` (the shared default pool if None)."""
+    return (pool or default_pool).request(method, url, body, headers)
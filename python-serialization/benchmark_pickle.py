@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Benchmarks CustomObject pickling: one file per object with
+serialize/deserialize against a single ObjectStore file, for small
+objects and for objects carrying a large bytes payload.
+
+Usage: ./benchmark_pickle.py [COUNT]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+mod = __import__("task_01_pickle")
+
+CASES = [("small", 0), ("1 MB payload", 1024 * 1024)]
+
+
+def make_objects(count, payload_size):
+    payload = os.urandom(payload_size) if payload_size else None
+    return [mod.CustomObject("user{}".format(i), 20 + i % 50, i % 2 == 0,
+                             payload) for i in range(count)]
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_files(tmp, objects):
+    paths = [os.path.join(tmp, "obj{}.pkl".format(i))
+             for i in range(len(objects))]
+    write = timed(lambda: [obj.serialize(path)
+                           for obj, path in zip(objects, paths)])
+    order = random.sample(paths, len(paths))
+    read = timed(lambda: [mod.CustomObject.deserialize(path)
+                          for path in order])
+    return write, read
+
+
+def bench_store(tmp, objects):
+    path = os.path.join(tmp, "objects.store")
+    keys = [obj.name for obj in objects]
+    with mod.ObjectStore(path) as store:
+        write = timed(lambda: store.put_many(zip(keys, objects)))
+    order = random.sample(keys, len(keys))
+    with mod.ObjectStore(path) as store:
+        read = timed(lambda: [store.get(key) for key in order])
+    return write, read
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print("{:<14} {:<8} {:>14} {:>14}".format(
+        "objects", "method", "writes/sec", "reads/sec"))
+    for label, payload_size in CASES:
+        # keep the payload case to about 1 GB on disk
+        n = count if not payload_size else min(count, 1000)
+        objects = make_objects(n, payload_size)
+        for method, bench in (("files", bench_files),
+                              ("store", bench_store)):
+            with tempfile.TemporaryDirectory() as tmp:
+                write, read = bench(tmp, objects)
+            print("{:<14} {:<8} {:>14.0f} {:>14.0f}".format(
+                label, method, n / write, n / read))
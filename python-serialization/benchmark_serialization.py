@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Benchmarks whole-file and streaming JSON (de)serialization.
+For each size, every operation runs in a fresh process so its peak RSS
+can be measured on its own.
+
+Usage: ./benchmark_serialization.py [SIZE_MB ...]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+mod = __import__("task_00_basic_serialization")
+
+RECORD = {"id": 0, "name": "John Doe", "age": 30, "is_student": False,
+          "tags": ["a", "b", "c"], "score": 99.5}
+
+
+def records(size_mb):
+    """Yields records until roughly size_mb of JSON has been produced"""
+    approx = len(mod._dumps(RECORD)) + 1
+    for i in range(size_mb * 1024 * 1024 // approx):
+        yield dict(RECORD, id=i)
+
+
+def run(op, path):
+    """Runs one operation in this process"""
+    if op == "dump":
+        mod.serialize_and_save_to_file(list(records(SIZE)), path)
+    elif op == "write_lines":
+        mod.save_json_lines(records(SIZE), path)
+    elif op == "load":
+        len(mod.load_and_deserialize(path))
+    elif op == "iter_array":
+        sum(1 for _ in mod.iter_json_array(path))
+    elif op == "read_lines":
+        sum(1 for _ in mod.load_json_lines(path))
+
+
+OPS = [("dump", ".json"), ("write_lines", ".jsonl"),
+       ("load", ".json"), ("iter_array", ".json"), ("read_lines", ".jsonl")]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        SIZE = int(sys.argv[3])
+        start = time.perf_counter()
+        run(sys.argv[2], os.environ["BENCH_FILE"])
+        elapsed = time.perf_counter() - start
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(elapsed, peak_kb)
+        sys.exit(0)
+
+    sizes = [int(s) for s in sys.argv[1:]] or [1, 10, 100]
+    print("orjson fast path: {}".format("on" if mod.orjson else "off"))
+    print("{:>6} {:<12} {:>10} {:>12}".format("MB", "op", "MB/s", "peak RSS"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for op, ext in OPS:
+                path = os.path.join(tmp, "data_{}{}".format(size, ext))
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", op, str(size)],
+                    env=dict(os.environ, BENCH_FILE=path),
+                    capture_output=True, text=True, check=True).stdout
+                elapsed, peak_kb = out.split()
+                mb = os.path.getsize(path) / (1024 * 1024)
+                print("{:>6} {:<12} {:>10.1f} {:>9.1f} MB".format(
+                    size, op, mb / float(elapsed), int(peak_kb) / 1024))
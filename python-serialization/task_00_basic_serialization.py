@@ -11,6 +11,20 @@ This class should have the following attributes:
 
 
 import json
+import re
+from itertools import chain
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CHUNK_SIZE = 64 * 1024
+# 19+ digits may not fit in 64 bits
+LONG_NUMBER = re.compile(r"\d{19}")
+# what may follow a prefix of a number up to the end of the buffer,
+# e.g. "0." or "1e" where raw_decode would stop early
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
 
 
 def serialize_and_save_to_file(data, filename):
@@ -20,9 +34,113 @@ def serialize_and_save_to_file(data, filename):
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(data, f)
 
+
 def load_and_deserialize(filename):
     """Function desirializes JSON data into python dictionery """
 
     with open(filename, "r", encoding="utf-8") as f:
         dictionery = json.load(f)
     return dictionery
+
+
+def _dumps(obj):
+    """Encodes one object as compact JSON text, using orjson if installed
+    Objects orjson rejects (non-str keys, ints beyond 64 bits) go
+    through json, and so does any output containing null, since orjson
+    writes NaN and Infinity as null. The values written therefore never
+    depend on whether orjson is installed.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj)
+        except TypeError:
+            data = None
+        if data is not None and b"null" not in data:
+            return data.decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _loads(text):
+    """Decodes JSON text, using orjson if installed
+    Text orjson rejects (NaN, Infinity) or could read lossily (orjson
+    turns ints beyond 64 bits into floats) is decoded by json instead.
+    """
+    if orjson is not None and not LONG_NUMBER.search(text):
+        try:
+            return orjson.loads(text)
+        except ValueError:
+            pass
+    return json.loads(text)
+
+
+def save_json_lines(items, filename):
+    """Function writes each item of an iterable as one JSON line
+    Items are written as they are produced, so any size fits in memory.
+    Returns the number of lines written.
+    """
+
+    count = 0
+    with open(filename, "w", encoding="utf-8") as f:
+        for item in items:
+            f.write(_dumps(item))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def load_json_lines(filename):
+    """Function yields the objects stored in a JSON-lines file one by one"""
+
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield _loads(line)
+
+
+def iter_json_items(chunks):
+    """Function yields the items of a top-level JSON array one by one
+    from an iterable of text chunks (a file, a streamed HTTP body...).
+    Only the current item and one chunk of text are held in memory.
+    Raises ValueError if the text is not a complete JSON array.
+    """
+
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    started = False
+    # None marks the end of the input; streams may yield empty chunks
+    for chunk in chain(chunks, (None,)):
+        final = chunk is None
+        buf = buf[pos:] + (chunk or "")
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # the item continues in the next chunk
+            if not final and NUMBER_TAIL.match(buf, end):
+                break  # a number at the end of the chunk may be cut short
+            yield item
+            pos = end
+    raise ValueError("Unterminated JSON array")
+
+
+def iter_json_array(filename, chunk_size=CHUNK_SIZE):
+    """Function yields the items of a top-level JSON array file one by one
+    Raises ValueError if the file is not a complete JSON array.
+    """
+
+    with open(filename, "r", encoding="utf-8") as f:
+        yield from iter_json_items(iter(lambda: f.read(chunk_size), ""))
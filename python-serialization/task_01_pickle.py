@@ -1,23 +1,51 @@
 #!/usr/bin/python3
 
 """
-Converting CSV Data to JSON Format
-Begin by importing the required modules: python import csv import json
-Define a function named convert_csv_to_json that takes the CSV filename
+Pickling Custom Classes
+Defines CustomObject, which can save itself to and load itself from a
+file, and ObjectStore, which keeps many pickled objects in a single
+append-only file with an index for lookups by key.
 """
 
 
+import os
 import pickle
+import struct
+
+# bytes payloads at least this big are written out-of-band (protocol 5)
+OUT_OF_BAND_MIN = 64 * 1024
 
 
 class CustomObject:
     """ class displays attributes """
 
-    def __init__(self, name, age, is_student):
+    __slots__ = ("name", "age", "is_student", "payload")
+
+    def __init__(self, name, age, is_student, payload=None):
         """method initializes object"""
         self.name = name
         self.age = age
         self.is_student = is_student
+        self.payload = payload
+
+    def __reduce_ex__(self, protocol):
+        """method pickles the object as a constructor call; with protocol
+        5 a large payload is handed over as a PickleBuffer so it can be
+        stored out-of-band without copying
+        """
+        payload = self.payload
+        if (protocol >= 5 and isinstance(payload, (bytes, bytearray))
+                and len(payload) >= OUT_OF_BAND_MIN):
+            payload = pickle.PickleBuffer(payload)
+        return (type(self), (self.name, self.age, self.is_student, payload))
+
+    def __setstate__(self, state):
+        """method restores objects pickled before __slots__ was added,
+        which carry their attributes as a __dict__
+        """
+        self.payload = None
+        for key, value in state.items():
+            setattr(self, key, value)
 
     def display(self):
         """method prints out attributes"""
@@ -31,8 +59,8 @@ class CustomObject:
 
         try:
             with open(filename, "wb") as f:
-                pickle.dump(self, f)
-        except:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError):
             return None
 
     @classmethod
@@ -43,5 +71,140 @@ class CustomObject:
             with open(filename, "rb") as f:
                 ret = pickle.load(f)
             return ret
-        except:
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, ValueError, TypeError, OverflowError, KeyError,
+                IndexError, MemoryError):
+            # corrupt data can fail in any of these ways (MemoryError
+            # from a garbage length field)
+            return None
+
+
+class ObjectStore:
+    """Stores pickled objects by key in one append-only file.
+
+    Each record is a header (key, pickle and buffer sizes), the key, the
+    protocol 5 pickle and then its out-of-band buffers. An in-memory
+    index maps every key to the offset of its latest record; it is
+    rebuilt on open by reading the headers only.
+    """
+
+    HEADER = struct.Struct("<HII")
+    # size of each out-of-band buffer and whether it was writable
+    BUFFER_INFO = struct.Struct("<Q?")
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, "a+b")
+        self._index = {}
+        self._load_index()
+
+    def _read_header(self):
+        """Reads a record header at the current position
+
+        Returns:
+            tuple: (key, pickle size, [(buffer size, writable), ...]),
+            or None if the file ends before the header does
+        """
+        f = self._file
+        header = f.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            return None
+        key_len, data_len, nbufs = self.HEADER.unpack(header)
+        key = f.read(key_len)
+        info = f.read(self.BUFFER_INFO.size * nbufs)
+        if (len(key) < key_len
+                or len(info) < self.BUFFER_INFO.size * nbufs):
             return None
+        return (key.decode("utf-8"), data_len,
+                list(self.BUFFER_INFO.iter_unpack(info)))
+
+    def _load_index(self):
+        """Indexes every complete record; a partial record left at the
+        end by an interrupted write is truncated away
+        """
+        f = self._file
+        end = f.seek(0, os.SEEK_END)
+        offset = f.seek(0)
+        while offset < end:
+            header = self._read_header()
+            if header is None:
+                break
+            key, data_len, buffers = header
+            record_end = f.tell() + data_len + sum(n for n, _ in buffers)
+            if record_end > end:
+                break
+            self._index[key] = offset
+            offset = f.seek(record_end)
+        if offset < end:
+            f.truncate(offset)
+
+    def _record(self, key, obj):
+        """Returns the chunks that make up one record"""
+        buffers = []
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        raws = [buf.raw() for buf in buffers]
+        key = key.encode("utf-8")
+        chunks = [self.HEADER.pack(len(key), len(data), len(raws)), key]
+        chunks += [self.BUFFER_INFO.pack(raw.nbytes, not raw.readonly)
+                   for raw in raws]
+        chunks.append(data)
+        chunks += raws
+        return chunks
+
+    def put(self, key, obj):
+        """Appends one object under key"""
+        self.put_many([(key, obj)])
+
+    def put_many(self, items):
+        """Appends (key, obj) pairs with a single write call"""
+        f = self._file
+        offset = f.seek(0, os.SEEK_END)
+        chunks = []
+        offsets = {}
+        for key, obj in items:
+            record = self._record(key, obj)
+            offsets[key] = offset
+            offset += sum(memoryview(c).nbytes for c in record)
+            chunks += record
+        f.writelines(chunks)
+        f.flush()
+        self._index.update(offsets)
+
+    def _read_buffer(self, size, writable):
+        """Reads one out-of-band buffer; writable ones (bytearray) are
+        read into a bytearray so they come back as one
+        """
+        if not writable:
+            return self._file.read(size)
+        buf = bytearray(size)
+        self._file.readinto(buf)
+        return buf
+
+    def get(self, key, default=None):
+        """Returns the latest object stored under key"""
+        offset = self._index.get(key)
+        if offset is None:
+            return default
+        self._file.seek(offset)
+        _, data_len, buffers = self._read_header()
+        data = self._file.read(data_len)
+        return pickle.loads(data, buffers=[self._read_buffer(*info)
+                                           for info in buffers])
+
+    def keys(self):
+        return self._index.keys()
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,28 +2,209 @@
 """Defines function that converts csv to json"""
 import csv
 import json
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
+NUMBER = re.compile(r"-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?")
+INTEGER = re.compile(r"-?\d+")
+ZERO_PADDED = re.compile(r"-?0\d")
 
-def convert_csv_to_json(csv_file):
+# column kinds, ordered so that merging two scans is max()
+EMPTY, INT, FLOAT, TEXT = range(4)
+
+
+def value_kind(value):
+    """Classifies one csv field; zero-padded numbers such as zip codes
+    or ids ("05") count as text so their leading zeros are kept
+    """
+    if not value:
+        return EMPTY
+    if ZERO_PADDED.match(value) or not NUMBER.fullmatch(value):
+        return TEXT
+    return INT if INTEGER.fullmatch(value) else FLOAT
+
+
+def _scan_rows(rows):
+    """Returns the widest kind seen in each column"""
+    kinds = {}
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, str):
+                kinds[key] = max(kinds.get(key, EMPTY), value_kind(value))
+    return kinds
+
+
+def _merge_kinds(scans):
+    kinds = {}
+    for scan in scans:
+        for key, kind in scan.items():
+            kinds[key] = max(kinds.get(key, EMPTY), kind)
+    return kinds
+
+
+def column_types(kinds):
+    """Maps each numeric column to int or float; columns that hold any
+    text stay strings
+    """
+    return {key: int if kind == INT else float
+            for key, kind in kinds.items() if kind in (INT, FLOAT)}
+
+
+def _format_row(row, ndjson, types):
+    """Returns one row as an array element (indent=4) or an ndjson line
+    types maps numeric columns to int or float; their empty fields
+    become null.
+    """
+    if types:
+        row = {key: (types[key](value) if value else None)
+               if key in types and isinstance(value, str) else value
+               for key, value in row.items()}
+    if ndjson:
+        return json.dumps(row) + "\n"
+    # the same layout json.dump(rows, f, indent=4) gives each element
+    return "    " + json.dumps(row, indent=4).replace("\n", "\n    ")
+
+
+def _write_rows(rows, out, ndjson, types, opening="\n"):
+    """Writes rows to an open file, returns True if any row was written
+    In array mode `opening` goes before the first element and ",\n"
+    between elements.
+    """
+    first = True
+    for row in rows:
+        if not ndjson:
+            out.write(opening if first else ",\n")
+        out.write(_format_row(row, ndjson, types))
+        first = False
+    return not first
+
+
+def _range_rows(csv_file, fieldnames, start, end):
+    """Reads the rows between byte offsets start and end"""
+    def lines():
+        with open(csv_file, "rb") as f:
+            f.seek(start)
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                yield line.decode("utf-8")
+
+    return csv.DictReader(lines(), fieldnames=fieldnames)
+
+
+def _scan_range(csv_file, fieldnames, start, end):
+    """Worker: column kinds of the rows between start and end"""
+    return _scan_rows(_range_rows(csv_file, fieldnames, start, end))
+
+
+def _convert_range(csv_file, fieldnames, start, end, part, ndjson, types):
+    """Worker: converts the rows between byte offsets start and end"""
+    rows = _range_rows(csv_file, fieldnames, start, end)
+    with open(part, "w", encoding="utf-8") as out:
+        return _write_rows(rows, out, ndjson, types, opening="")
+
+
+def _split_points(csv_file, data_start, parts):
+    """Byte offsets that cut the data into parts on line boundaries"""
+    size = os.path.getsize(csv_file)
+    points = [data_start]
+    with open(csv_file, "rb") as f:
+        for n in range(1, parts):
+            f.seek(max(points[-1], data_start + (size - data_start) * n
+                       // parts))
+            f.readline()
+            points.append(f.tell())
+    points.append(size)
+    return sorted(set(points))
+
+
+def convert_csv_to_json(csv_file, output="data.json", ndjson=False,
+                        infer_types=False, workers=1):
     """Function writes data to data.json
+    Rows are streamed from the csv file to the output one at a time.
     Args:
         csv_file: csv file to convert
-        data.json: json file to write to
+        output: json file to write to (data.json by default)
+        ndjson: write one JSON object per line instead of an array
+        infer_types: turn numeric columns into int/float. A first pass
+            over the file decides per column: a column is converted
+            only if every non-empty value is a number without leading
+            zeros, and is float if any value is. Empty fields in
+            numeric columns become null.
+        workers: processes to use; the file is split on line breaks,
+            so keep the default of 1 if quoted fields contain newlines
     """
 
-    data = []
     try:
-        with open(csv_file, encoding="utf-8") as csvf:
-            csvReader = csv.DictReader(csvf)
-            for row in csvReader:
-                data.append(row)
-
+        with open(csv_file, encoding="utf-8", newline="") as csvf:
+            if workers <= 1:
+                types = None
+                if infer_types:
+                    types = column_types(_scan_rows(csv.DictReader(csvf)))
+                    csvf.seek(0)
+                with open(output, "w", encoding="utf-8") as f:
+                    if not ndjson:
+                        f.write("[")
+                    wrote = _write_rows(csv.DictReader(csvf), f, ndjson,
+                                        types)
+                    if not ndjson:
+                        f.write("\n]" if wrote else "]")
+                return True
+            fieldnames = next(csv.reader(csvf), None)
     except FileNotFoundError:
         return False
+    except OSError:
+        return False
+
+    return _convert_parallel(csv_file, fieldnames, output, ndjson,
+                             infer_types, workers)
+
+
+def _convert_parallel(csv_file, fieldnames, output, ndjson, infer_types,
+                      workers):
+    """Converts ranges of the file in worker processes and joins the
+    results in their original order. With infer_types the workers first
+    scan their ranges and the column kinds are merged.
+    """
+    with open(csv_file, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+    points = _split_points(csv_file, data_start, workers)
 
     try:
-        with open("data.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-    except:
+        with tempfile.TemporaryDirectory() as tmp:
+            parts = [os.path.join(tmp, "part_{}".format(n))
+                     for n in range(len(points) - 1)]
+            files = [csv_file] * len(parts)
+            names = [fieldnames] * len(parts)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                types = None
+                if infer_types:
+                    types = column_types(_merge_kinds(pool.map(
+                        _scan_range, files, names, points[:-1],
+                        points[1:])))
+                wrote = list(pool.map(
+                    _convert_range, files, names, points[:-1], points[1:],
+                    parts, [ndjson] * len(parts), [types] * len(parts)))
+
+            with open(output, "w", encoding="utf-8") as f:
+                if not ndjson:
+                    f.write("[")
+                first = True
+                for part, has_rows in zip(parts, wrote):
+                    if not has_rows:
+                        continue
+                    if not ndjson:
+                        f.write("\n" if first else ",\n")
+                    with open(part, encoding="utf-8") as p:
+                        shutil.copyfileobj(p, f)
+                    first = False
+                if not ndjson:
+                    f.write("\n]" if not first else "]")
+    except OSError:
         return False
     return True
@@ -1,11 +1,48 @@
 #!/usr/bin/python3
 
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import XMLGenerator
+
+# Python types written to the `type` attribute; str is the default
+TYPE_NAMES = {bool: "bool", int: "int", float: "float", type(None): "none",
+              dict: "dict", list: "list", tuple: "list"}
+
+CONVERTERS = {
+    "int": int,
+    "float": float,
+    "bool": lambda text: text == "True",
+    "none": lambda text: None,
+    "str": lambda text: text or "",
+}
+
+
+def _write_value(gen, tag, value):
+    """
+    Write one value as an element, recursing into dicts and lists.
+    Non-string values get a `type` attribute so they can be restored.
+    """
+    type_name = TYPE_NAMES.get(type(value))
+    gen.startElement(tag, {"type": type_name} if type_name else {})
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _write_value(gen, key, item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _write_value(gen, "item", item)
+    elif value is not None:
+        gen.characters(str(value))
+    gen.endElement(tag)
+
 
 def serialize_to_xml(dictionary, filename):
     """
     Serialize a Python dictionary into XML format and save it to a file.
 
+    Elements are written to the file as they are produced, so no tree is
+    built in memory. Nested dictionaries and lists are supported (list
+    entries become <item> elements) and ints, floats, bools and None are
+    tagged with their type.
+
     Args:
     - dictionary (dict): Python dictionary to serialize.
     - filename (str): Filename to save the XML data.
@@ -13,29 +50,59 @@ def serialize_to_xml(dictionary, filename):
     Returns:
     - None
     """
-    root = ET.Element('data')
-    for key, value in dictionary.items():
-        child = ET.SubElement(root, key)
-        child.text = str(value)  # Convert value to string for XML serialization
+    with open(filename, "w", encoding="utf-8") as f:
+        gen = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+        gen.startElement("data", {})
+        for key, value in dictionary.items():
+            _write_value(gen, key, value)
+        gen.endElement("data")
 
-    tree = ET.ElementTree(root)
-    tree.write(filename)
 
 def deserialize_from_xml(filename):
     """
     Deserialize XML data from a file into a Python dictionary.
 
+    The file is read incrementally with iterparse and every element is
+    cleared once it has been converted, so memory does not grow with the
+    size of the document. Values are converted back to the type recorded
+    in their `type` attribute; untyped values stay strings.
+
     Args:
     - filename (str): Filename from which to read XML data.
 
     Returns:
     - dict: Deserialized Python dictionary.
     """
-    tree = ET.parse(filename)
-    root = tree.getroot()
+    root = None
+    # one [element, container] pair per open dict/list element
+    stack = []
+
+    for event, elem in ET.iterparse(filename, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+                stack.append([elem, {}])
+            elif elem.get("type") == "dict":
+                stack.append([elem, {}])
+            elif elem.get("type") == "list":
+                stack.append([elem, []])
+            continue
+
+        if elem is root:
+            return stack[0][1]
+
+        if stack[-1][0] is elem:
+            value = stack.pop()[1]
+        else:
+            value = CONVERTERS[elem.get("type", "str")](elem.text)
 
-    dictionary = {}
-    for child in root:
-        dictionary[child.tag] = child.text  # Convert text back to appropriate Python type if needed
+        parent_elem, container = stack[-1]
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[elem.tag] = value
+        # every earlier sibling is done too, so drop them all
+        elem.clear()
+        del parent_elem[:]
 
-    return dictionary
+    return {}
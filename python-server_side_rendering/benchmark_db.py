@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+''' Compares fetch_data_from_sqlite throughput with and without pooling '''
+
+
+import sqlite3
+import time
+from product_store import pool, DB_PATH
+
+
+def fetch_unpooled():
+    conn = sqlite3.connect(DB_PATH)
+    rows = conn.execute('SELECT id, name, category, price FROM Products')
+    rows = rows.fetchall()
+    conn.close()
+    return rows
+
+
+def fetch_pooled():
+    return pool.execute('SELECT id, name, category, price FROM Products')
+
+
+def bench(func, n=5000):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return n / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    print("unpooled: {:.0f} req/s".format(bench(fetch_unpooled)))
+    print("pooled:   {:.0f} req/s".format(bench(fetch_pooled)))
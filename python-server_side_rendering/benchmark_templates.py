@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+''' Measures app startup and first-render time, with and without
+precompiled templates '''
+
+
+import os
+import sys
+import tempfile
+import time
+from flask import Flask, render_template
+from template_env import configure_templates
+
+
+def startup_and_first_render(precompile, cache_dir):
+    """Returns (startup, first render) seconds for a fresh app."""
+    start = time.perf_counter()
+    app = Flask(__name__)
+    if precompile:
+        configure_templates(app, cache_dir=cache_dir)
+    ready = time.perf_counter()
+    with app.test_request_context('/products'):
+        render_template('product_display.html', products=[])
+    return ready - start, time.perf_counter() - ready
+
+
+if __name__ == '__main__':
+    os.environ['APP_ENV'] = 'production'
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp()
+    for label, precompile in (('default', False), ('cold cache', True),
+                              ('warm cache', True)):
+        startup, render = startup_and_first_render(precompile, cache_dir)
+        print("{:<11} startup {:7.2f} ms, first render {:7.2f} ms".format(
+            label, startup * 1000, render * 1000))
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""Checks that every filter combination of /products?source=sql is
+answered with an index (or the id primary key) rather than a full scan
+"""
+import os
+import tempfile
+from database import create_database
+from product_store import ConnectionPool, explain_product_query
+
+CASES = [
+    {'id': 1},
+    {'after_id': 1},
+    {'category': 'Electronics'},
+    {'min_price': 10.0},
+    {'max_price': 100.0},
+    {'min_price': 10.0, 'max_price': 100.0},
+    {'category': 'Electronics', 'min_price': 10.0},
+    {'category': 'Electronics', 'min_price': 10.0, 'max_price': 100.0},
+    {'category': 'Electronics', 'after_id': 1},
+]
+INDEXED = ('USING INDEX idx_products_', 'USING COVERING INDEX idx_products_',
+           'USING INTEGER PRIMARY KEY')
+
+
+def check(db_pool):
+    """Asserts the plan of each case, unpaged and paged, uses an index"""
+    for filters in CASES:
+        for limit in (None, 50):
+            plan = explain_product_query(filters, limit, db_pool)
+            lookups = [line for line in plan if 'Products' in line]
+            assert lookups, (filters, plan)
+            for line in lookups:
+                assert any(used in line for used in INDEXED), \
+                    (filters, limit, plan)
+            print("{!r:<70} {}".format(
+                dict(filters, limit=limit), "; ".join(lookups)))
+
+
+if __name__ == "__main__":
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # create_database writes products.db in the working directory
+        os.chdir(tmp)
+        try:
+            create_database()
+            db_pool = ConnectionPool(os.path.join(tmp, 'products.db'))
+            check(db_pool)
+            db_pool.close()
+        finally:
+            os.chdir(cwd)
+    print("OK: all {} queries use an index".format(2 * len(CASES)))
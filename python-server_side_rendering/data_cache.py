@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+''' In-memory cache for parsed JSON/CSV data sources '''
+
+
+import os
+import threading
+
+
+class DataSourceCache:
+    """Caches parsed files by path and re-parses only when they change.
+
+    A file counts as changed when its mtime or size differs from the
+    values seen when it was last parsed. Each entry also keeps an
+    ``id -> record`` index for list data, or for any object that
+    provides an ``id_index()`` method.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path, parser):
+        """Returns the parsed contents of path, parsing it if needed.
+
+        Args:
+            path (str): file to read
+            parser (callable): takes an open file and returns the data
+
+        Raises:
+            FileNotFoundError: if path does not exist
+        """
+        return self._entry(path, parser)[1]
+
+    def index(self, path, parser):
+        """Returns the ``id -> record`` index for path."""
+        return self._entry(path, parser)[2]
+
+    def _entry(self, path, parser):
+        st = os.stat(path)
+        version = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry
+
+        with open(path, 'r', newline='') as f:
+            data = parser(f)
+        index = {}
+        if isinstance(data, list):
+            index = {row['id']: row for row in data
+                     if isinstance(row, dict) and 'id' in row}
+        elif hasattr(data, 'id_index'):
+            index = data.id_index()
+        entry = (version, data, index)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = entry
+        return entry
+
+    def version(self, path):
+        """Returns the (mtime, size) of the cached parse, or None."""
+        entry = self._entries.get(path)
+        return entry[0] if entry else None
+
+    def stats(self):
+        """Returns hit/miss counters and the number of cached files."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+cache = DataSourceCache()
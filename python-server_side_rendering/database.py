@@ -5,6 +5,9 @@ import sqlite3
 
 def create_database():
     conn = sqlite3.connect('products.db')
+    # WAL lets the pooled readers run alongside a writer; the mode is
+    # stored in the file, so it only needs setting here
+    conn.execute('PRAGMA journal_mode=WAL')
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS Products (
@@ -14,6 +17,14 @@ def create_database():
             price REAL NOT NULL
         )
     ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_products_category_price
+        ON Products (category, price)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_products_price
+        ON Products (price)
+    ''')
     cursor.execute('''
         INSERT INTO Products (id, name, category, price)
         VALUES
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+''' Rendered-page cache with ETag support for the Flask routes '''
+
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, request
+
+
+def file_version(*paths):
+    """Returns the (mtime, size) of each path, None for missing files."""
+    version = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            version.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+
+class FragmentCache:
+    """Bounded LRU cache of rendered pages with a time-to-live.
+
+    Entries are keyed on the route path, the query args and a data
+    version supplied by the route, so a change to the underlying data
+    produces a new key (and a new ETag) instead of a stale page.
+    """
+
+    def __init__(self, max_entries=256, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, body):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def cached(self, version):
+        """Decorator caching a route's HTML output.
+
+        Args:
+            version (callable): returns a hashable value identifying the
+                current state of the data the route reads
+
+        The route may return a string or an iterable of strings (e.g.
+        from stream_template); anything else, such as an error tuple,
+        is passed through uncached.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key = (request.path,
+                       tuple(sorted(request.args.items(multi=True))),
+                       version())
+                etag = hashlib.sha1(repr(key).encode()).hexdigest()
+
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304)
+                    response.set_etag(etag)
+                    return response
+
+                body = self.get(key)
+                if body is None:
+                    result = view(*args, **kwargs)
+                    if isinstance(result, str):
+                        self.set(key, result)
+                        body = result
+                    elif isinstance(result, (tuple, Response)):
+                        return result
+                    else:
+                        body = self._collect(key, result)
+
+                response = Response(body, mimetype='text/html')
+                response.set_etag(etag)
+                return response
+            return wrapper
+        return decorator
+
+    def _collect(self, key, chunks):
+        """Yields chunks through and stores the page once it completes."""
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        self.set(key, ''.join(parts))
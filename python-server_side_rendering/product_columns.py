@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+''' Compact columnar storage for product rows loaded from CSV '''
+
+
+import csv
+import sys
+from array import array
+
+
+class ProductRow:
+    """Lightweight view of one row in a ProductColumns table.
+
+    Supports attribute access (``row.name``) for templates and item
+    access (``row['name']``) for code written against dict rows.
+    """
+
+    __slots__ = ('_table', '_pos')
+
+    def __init__(self, table, pos):
+        self._table = table
+        self._pos = pos
+
+    @property
+    def id(self):
+        return self._table.ids[self._pos]
+
+    @property
+    def name(self):
+        return self._table.names[self._pos]
+
+    @property
+    def category(self):
+        return self._table.categories[self._pos]
+
+    @property
+    def price(self):
+        return self._table.prices[self._pos]
+
+    def __getitem__(self, key):
+        if key not in ('id', 'name', 'category', 'price'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return "ProductRow(id={}, name={!r}, category={!r}, price={})".format(
+            self.id, self.name, self.category, self.price)
+
+
+class ProductColumns:
+    """Products stored column by column instead of as a list of dicts.
+
+    ids and prices live in typed arrays and category strings are
+    interned, so repeated categories share one object.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.prices = array('d')
+        self.names = []
+        self.categories = []
+
+    def append(self, product_id, name, category, price):
+        self.ids.append(int(product_id))
+        self.names.append(name)
+        self.categories.append(sys.intern(category))
+        self.prices.append(float(price))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += len(self.ids)
+        if not 0 <= pos < len(self.ids):
+            raise IndexError(pos)
+        return ProductRow(self, pos)
+
+    def __iter__(self):
+        for pos in range(len(self.ids)):
+            yield ProductRow(self, pos)
+
+    def id_index(self):
+        """Returns a dict mapping each id to its row view."""
+        return {product_id: ProductRow(self, pos)
+                for pos, product_id in enumerate(self.ids)}
+
+    def rows(self, positions):
+        return [ProductRow(self, pos) for pos in positions]
+
+    def where_category(self, category):
+        """Returns the rows whose category equals category."""
+        category = sys.intern(category)
+        return self.rows(pos for pos, c in enumerate(self.categories)
+                         if c is category)
+
+    def where_price(self, min_price=None, max_price=None):
+        """Returns the rows with min_price <= price <= max_price."""
+        low = float('-inf') if min_price is None else min_price
+        high = float('inf') if max_price is None else max_price
+        return self.rows(pos for pos, p in enumerate(self.prices)
+                         if low <= p <= high)
+
+
+def load_product_columns(f):
+    """Parses product rows from an open CSV file into a ProductColumns."""
+    table = ProductColumns()
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return table
+    cols = [header.index(key) for key in ('id', 'name', 'category', 'price')]
+    for row in reader:
+        if row:
+            table.append(*(row[c] for c in cols))
+    return table
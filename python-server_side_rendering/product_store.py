@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+''' Product data access shared by the SQLite-backed Flask apps '''
+
+
+import sqlite3
+import json
+import csv
+import queue
+import threading
+from itertools import islice
+from operator import itemgetter
+from data_cache import cache
+
+DB_PATH = 'products.db'
+POOL_SIZE = 5
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class ConnectionPool:
+    """Thread-safe pool of reusable SQLite connections."""
+
+    def __init__(self, db_path=DB_PATH, size=POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # sqlite3 keeps its own prepared statement cache per connection
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=128)
+        return conn, conn.cursor()
+
+    def acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._pool.get()
+
+    def release(self, item):
+        self._pool.put(item)
+
+    def execute(self, sql, params=()):
+        """Runs a query on a pooled connection and returns all rows."""
+        item = self.acquire()
+        try:
+            return item[1].execute(sql, params).fetchall()
+        finally:
+            self.release(item)
+
+    def close(self):
+        while True:
+            try:
+                conn, cursor = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            cursor.close()
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+pool = ConnectionPool()
+
+
+def parse_json(file):
+    """Parses a JSON product list, sorted by id like the SQL source."""
+    products = json.load(file)
+    if isinstance(products, list):
+        products.sort(key=itemgetter('id'))
+    return products
+
+
+def parse_csv(file):
+    products = []
+    reader = csv.DictReader(file)
+    for row in reader:
+        row['id'] = int(row['id'])
+        row['price'] = float(row['price'])
+        products.append(row)
+    # keyset paging (after_id) relies on rows being in id order
+    products.sort(key=itemgetter('id'))
+    return products
+
+
+def read_json(file_path):
+    return cache.load(file_path, parse_json)
+
+
+def read_csv(file_path):
+    return cache.load(file_path, parse_csv)
+
+
+def build_product_query(filters, limit=None, offset=0):
+    """Turns a filters dict into a parameterized SELECT on Products."""
+    clauses = []
+    params = []
+    if filters.get('id') is not None:
+        clauses.append('id = ?')
+        params.append(filters['id'])
+    if filters.get('after_id') is not None:
+        clauses.append('id > ?')
+        params.append(filters['after_id'])
+    if filters.get('category') is not None:
+        clauses.append('category = ?')
+        params.append(filters['category'])
+    if filters.get('min_price') is not None:
+        clauses.append('price >= ?')
+        params.append(filters['min_price'])
+    if filters.get('max_price') is not None:
+        clauses.append('price <= ?')
+        params.append(filters['max_price'])
+
+    sql = 'SELECT id, name, category, price FROM Products'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    if limit is not None:
+        order = 'id'
+        if ((filters.get('min_price') is not None
+             or filters.get('max_price') is not None)
+                and filters.get('id') is None
+                and filters.get('after_id') is None):
+            # without this, a one-sided price range with ORDER BY id is
+            # planned as a full scan in rowid order instead of a search
+            # on idx_products_price; '+id' stops id from matching rowid
+            order = '+id'
+        sql += ' ORDER BY {} LIMIT ? OFFSET ?'.format(order)
+        params.extend([limit, offset])
+    return sql, params
+
+
+def explain_product_query(filters, limit=None, db_pool=None):
+    """Returns the EXPLAIN QUERY PLAN detail lines for a filtered query."""
+    sql, params = build_product_query(filters, limit)
+    rows = (db_pool or pool).execute('EXPLAIN QUERY PLAN ' + sql, params)
+    return [row[3] for row in rows]
+
+
+def fetch_data_from_sqlite(filters=None, limit=None, offset=0):
+    sql, params = build_product_query(filters or {}, limit, offset)
+    rows = pool.execute(sql, params)
+    return [
+        {'id': row[0], 'name': row[1], 'category': row[2], 'price': row[3]}
+        for row in rows
+    ]
+
+
+def filter_products(products, filters, limit=None, offset=0):
+    """Applies the same filters as build_product_query to loaded rows."""
+    matches = (
+        p for p in products
+        if (filters.get('id') is None or p['id'] == filters['id'])
+        and (filters.get('after_id') is None
+             or p['id'] > filters['after_id'])
+        and (filters.get('category') is None
+             or p['category'] == filters['category'])
+        and (filters.get('min_price') is None
+             or p['price'] >= filters['min_price'])
+        and (filters.get('max_price') is None
+             or p['price'] <= filters['max_price'])
+    )
+    stop = None if limit is None else offset + limit
+    return list(islice(matches, offset, stop))
+
+
+def parse_filters(args):
+    """Reads id, after_id, category and the price range from the query args.
+
+    Raises ValueError naming the first parameter with a bad value.
+    """
+    filters = {'category': args.get('category') or None}
+    for key, cast in (('id', int), ('after_id', int), ('min_price', float),
+                      ('max_price', float)):
+        value = args.get(key)
+        if value:
+            try:
+                filters[key] = cast(value)
+            except ValueError:
+                raise ValueError(key)
+    return filters
+
+
+def parse_page(args):
+    """Reads limit and offset from the query args, capping limit."""
+    try:
+        limit = int(args.get('limit') or DEFAULT_LIMIT)
+    except ValueError:
+        raise ValueError('limit')
+    try:
+        offset = int(args.get('offset') or 0)
+    except ValueError:
+        raise ValueError('offset')
+    if limit < 1 or offset < 0:
+        raise ValueError('limit' if limit < 1 else 'offset')
+    return min(limit, MAX_LIMIT), offset
@@ -2,13 +2,31 @@
 ''' Extending Dynamic Data Display to Include SQLite in Flask '''
 
 
-from flask import Flask, render_template, request
-import sqlite3
+from flask import Flask, render_template, request, stream_template, url_for
 import json
-import csv
 import os
+from data_cache import cache
+from product_store import (DB_PATH, read_json, read_csv,
+                           fetch_data_from_sqlite, filter_products,
+                           parse_filters, parse_page)
+from template_env import configure_templates
+from fragment_cache import FragmentCache, file_version
 
 app = Flask(__name__)
+configure_templates(app)
+
+fragments = FragmentCache()
+
+SOURCE_FILES = {
+    'json': ('products.json',),
+    'csv': ('products.csv',),
+    'sql': (DB_PATH, DB_PATH + '-wal'),
+}
+
+
+def products_version():
+    """Version of the data behind the requested /products source."""
+    return file_version(*SOURCE_FILES.get(request.args.get('source'), ()))
 
 
 @app.route('/')
@@ -27,6 +45,7 @@ def contact():
 
 
 @app.route('/items')
+@fragments.cached(version=lambda: file_version('items.json'))
 def items():
     try:
         with open('items.json') as f:
@@ -39,55 +58,25 @@ def items():
         return "Error decoding JSON", 500
 
 
-def read_json(file_path):
-    with open(file_path, 'r') as file:
-        return json.load(file)
-
-
-def read_csv(file_path):
-    products = []
-    with open(file_path, 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            row['id'] = int(row['id'])
-            row['price'] = float(row['price'])
-            products.append(row)
-    return products
-
-
-def fetch_data_from_sqlite():
-    conn = sqlite3.connect('products.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM Products')
-    rows = cursor.fetchall()
-    conn.close()
-
-    products = []
-    for row in rows:
-        product = {
-            'id': row[0],
-            'name': row[1],
-            'category': row[2],
-            'price': row[3]
-        }
-        products.append(product)
-
-    print(products)
-    return products
-
-
 @app.route('/products')
+@fragments.cached(version=products_version)
 def products():
     source = request.args.get('source')
-    product_id = request.args.get('id')
     file_path = ''
 
+    try:
+        filters = parse_filters(request.args)
+        limit, offset = parse_page(request.args)
+    except ValueError as e:
+        return render_template('product_display.html',
+                               error="Invalid {}".format(e))
+
     if source == 'json':
         file_path = 'products.json'
     elif source == 'csv':
         file_path = 'products.csv'
     elif source == 'sql':
-        products = fetch_data_from_sqlite()
+        products = fetch_data_from_sqlite(filters, limit, offset)
     else:
         return render_template('product_display.html', error="Wrong source")
 
@@ -95,20 +84,31 @@ def products():
         return render_template('product_display.html', error="File not found")
 
     if source == 'json':
-        products = read_json(file_path)
+        products = filter_products(read_json(file_path), filters,
+                                   limit, offset)
     elif source == 'csv':
-        products = read_csv(file_path)
-
-    if product_id:
-        try:
-            product_id = int(product_id)
-            products = [p for p in products if p['id'] == product_id]
-            if not products:
-                return render_template('product_display.html', error="Product not found")
-        except ValueError:
-            return render_template('product_display.html', error="Invalid id")
-
-    return render_template('product_display.html', products=products)
+        products = filter_products(read_csv(file_path), filters,
+                                   limit, offset)
+
+    if filters.get('id') is not None and not products:
+        return render_template('product_display.html',
+                               error="Product not found")
+
+    next_url = None
+    if len(products) == limit:
+        # keyset pagination: the next page starts after the last id shown
+        args = request.args.to_dict()
+        args.pop('offset', None)
+        args['after_id'] = products[-1]['id']
+        next_url = url_for('products', **args)
+
+    return stream_template('product_display.html', products=products,
+                           next_url=next_url)
+
+
+@app.route('/cache_stats')
+def cache_stats():
+    return cache.stats()
 
 
 if __name__ == '__main__':
@@ -1,59 +1,267 @@
 #!/usr/bin/python3
+import csv
+import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 """Program defines function that generates personalized invitation files
 """
 
-def generate_invitations(template, attendees):
+FIELDS = ("name", "event_title", "event_date", "event_location")
+PLACEHOLDER = re.compile(r"\{(" + "|".join(FIELDS) + r")\}")
+OUTPUT_FILE = re.compile(r"^output_(\d+)\.txt$")
+
+
+def compile_template(template):
+    """Splits a template into literal text and placeholder names once
+
+    Args:
+        template (str)
+
+    Returns:
+        list: literal strings at even positions, field names at odd ones
+    """
+    return PLACEHOLDER.split(template)
+
+
+def render_invitation(plan, attendee):
+    """Fills a compiled template in a single pass
+
+    Args:
+        plan (list): result of compile_template
+        attendee (dict)
+
+    Returns:
+        str: the invitation text
+    """
+    parts = plan[:]
+    for i in range(1, len(parts), 2):
+        parts[i] = attendee.get(parts[i]) or "N/A"
+    return "".join(parts)
+
+
+def write_invitation(current_file, text):
+    """Writes one invitation, refusing to overwrite an existing file
+
+    The text goes to a hidden temporary file that is then linked into
+    place, so an output file is either complete or absent even if the
+    process dies mid-write.
+
+    Returns:
+        bool: True if the file was written
+    """
+    directory, name = os.path.split(current_file)
+    tmp = os.path.join(directory, f".{name}.tmp")
+    with open(tmp, 'w') as output:
+        output.write(text)
+    try:
+        os.link(tmp, current_file)
+    except FileExistsError:
+        print(f"{current_file} already exists")
+        return False
+    finally:
+        os.remove(tmp)
+    return True
+
+
+def read_attendees(path):
+    """Streams attendee dicts from a JSON-lines (.jsonl) or CSV file
+
+    Args:
+        path (str)
+
+    Yields:
+        dict: one attendee at a time
+    """
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def last_written_number(directory='.', sink=None):
+    """Finds the number of the last invitation written by an earlier run
+
+    For files this is the end of the unbroken run output_1..output_N:
+    the thread pool writes out of order, so a crash can leave gaps
+    below the highest number. With a sink, a partially written trailing
+    line is cut off so appending can continue cleanly.
+
+    Returns:
+        int: 0 when nothing has been written yet
+    """
+    if sink is None:
+        matches = map(OUTPUT_FILE.match, os.listdir(directory))
+        numbers = {int(m.group(1)) for m in matches if m}
+        last = 0
+        while last + 1 in numbers:
+            last += 1
+        return last
+
+    if not os.path.exists(sink):
+        return 0
+    last, good_end = 0, 0
+    with open(sink, 'rb') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            last = int(OUTPUT_FILE.match(record["file"]).group(1))
+            good_end = f.tell()
+    with open(sink, 'r+b') as f:
+        f.truncate(good_end)
+    return last
+
+
+def _numbered(attendees, resume, sink=None):
+    """Pairs attendees with their output numbers, skipping finished ones"""
+    done = last_written_number(sink=sink) if resume else 0
+    if done:
+        attendees = islice(attendees, done, None)
+    return enumerate(attendees, start=done + 1)
+
+
+def _is_attendee_iterable(attendees):
+    if attendees is None or isinstance(attendees, (str, bytes, dict)):
+        return False
+    return hasattr(attendees, '__iter__')
+
+
+def generate_invitations(template, attendees, progress=None,
+                         progress_every=1000, resume=False):
     """Function generates invitations
 
     Args:
         template (str)
-        attendees (list)
+        attendees (iterable): list, generator or any iterable of dicts
+        progress (callable): called with the number of the last written
+            invitation every progress_every invitations and at the end
+        progress_every (int)
+        resume (bool): continue from the first output_N.txt missing
+            after a previous run, skipping the attendees before it
 
     Returns:
         _type_: _description_
     """
 
-    if not isinstance(template, str) or template is None: 
+    if not isinstance(template, str) or template is None:
         print("Template is supposed to be a string")
         return
-    
-    if not isinstance(attendees, list) or attendees is None:
+
+    if not _is_attendee_iterable(attendees):
         print("Attendees is supposed to be a list")
         return
 
     if not template:
         print("Template is empty, no output files generated.")
         return
-    
-    if not attendees:
+
+    if isinstance(attendees, list) and not attendees:
         print("No data provided, no output files generated.")
         return
-    
-    
+
     try:
-        for x, attendee in enumerate(attendees, start=1):
-            attendee_name = attendee.get("name") or "N/A"
-            attendee_title = attendee.get("event_title") or "N/A"
-            attendee_date = attendee.get("event_date") or "N/A"
-            attendee_location = attendee.get("event_location") or "N/A"
+        plan = compile_template(template)
+        x = None
+        for x, attendee in _numbered(attendees, resume):
+            write_invitation(f"output_{x}.txt",
+                             render_invitation(plan, attendee))
+            if progress and x % progress_every == 0:
+                progress(x)
+
+        if x is None:
+            print("No data provided, no output files generated.")
+        elif progress:
+            progress(x)
+
+    except Exception as e:
+        print(f"{e} found")
+        return
 
 
-            replace_name = "{name}"
-            replace_title = "{event_title}"
-            replace_date = "{event_date}"
-            replace_location = "{event_location}"
+def generate_invitations_batch(template, attendees, workers=8, sink=None,
+                               progress=None, resume=False, chunk_size=1024):
+    """Generates invitations in bulk and reports throughput
 
-            replace_text = template.replace(replace_name, attendee_name).replace(replace_title, attendee_title).replace(replace_date, attendee_date).replace(replace_location, attendee_location)
-            current_file = f"output_{x}.txt"
+    The template is compiled once. Files are written from a thread
+    pool, or, when sink is given, appended as JSON lines of the form
+    {"file": "output_N.txt", "text": ...} to that single file.
+    Attendees are consumed chunk_size at a time, so memory use does not
+    grow with the number of attendees.
 
-            if os.path.exists(current_file):
-                print(f"{current_file} already exists")
-                continue
-            
-            with open(current_file, 'w') as output:
-                output.write(replace_text)
+    Args:
+        template (str)
+        attendees (iterable): list, generator or any iterable of dicts
+        workers (int): number of writer threads
+        sink (str): optional path of an ndjson output file
+        progress (callable): called with the last written number after
+            each chunk
+        resume (bool): continue after the last invitation already written
+        chunk_size (int)
 
+    Returns:
+        dict: written and skipped counts, seconds and files_per_sec
+    """
+    if not isinstance(template, str) or not template:
+        print("Template is supposed to be a non-empty string")
+        return None
+    if not _is_attendee_iterable(attendees):
+        print("Attendees is supposed to be an iterable of dicts")
+        return None
+
+    def write(item):
+        return write_invitation(f"output_{item[0]}.txt",
+                                render_invitation(plan, item[1]))
+
+    start = time.perf_counter()
+    total = written = 0
+    try:
+        plan = compile_template(template)
+        numbered = _numbered(attendees, resume, sink)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            output = open(sink, 'a') if sink is not None else None
+            try:
+                while True:
+                    chunk = list(islice(numbered, chunk_size))
+                    if not chunk:
+                        break
+                    if output is not None:
+                        output.writelines(json.dumps({
+                            "file": f"output_{x}.txt",
+                            "text": render_invitation(plan, attendee)})
+                            + "\n" for x, attendee in chunk)
+                        written += len(chunk)
+                    else:
+                        written += sum(pool.map(write, chunk))
+                    total += len(chunk)
+                    if progress:
+                        progress(chunk[-1][0])
+            finally:
+                if output is not None:
+                    output.close()
     except Exception as e:
+        # same reporting as generate_invitations, e.g. for an attendee
+        # that is not a dict
         print(f"{e} found")
-        return
+        return None
+
+    if not total:
+        print("No data provided, no output files generated.")
+        return None
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "written": written,
+        "skipped": total - written,
+        "seconds": seconds,
+        "files_per_sec": written / seconds if seconds else 0.0,
+    }
+    print("{} invitations in {:.2f}s ({:.0f} files/sec)".format(
+        written, seconds, stats["files_per_sec"]))
+    return stats
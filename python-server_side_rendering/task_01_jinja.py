@@ -3,9 +3,11 @@
 
 
 from flask import Flask, render_template
+from template_env import configure_templates
 
 # Initialize the Flask application
 app = Flask(__name__)
+configure_templates(app)
 
 # --- Routes ---
 
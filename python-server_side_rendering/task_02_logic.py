@@ -4,9 +4,15 @@
 from flask import Flask, render_template
 import json
 import os
+from template_env import configure_templates
+from fragment_cache import FragmentCache, file_version
 
 # Initialize the Flask application
 app = Flask(__name__)
+configure_templates(app)
+fragments = FragmentCache()
+ITEMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'items.json')
 
 # Helper function to load data from items.json
 def load_items_from_json(filename='items.json'):
@@ -31,6 +37,7 @@ def load_items_from_json(filename='items.json'):
         return []
 
 @app.route('/items')
+@fragments.cached(version=lambda: file_version(ITEMS_PATH))
 def items():
     """
     Loads data from items.json and renders items.html with the list.
@@ -4,19 +4,25 @@
 
 from flask import Flask, render_template, request
 import json
-import csv
 import os
+from data_cache import cache
+from product_columns import load_product_columns
+from template_env import configure_templates
 
 app = Flask(__name__)
+configure_templates(app)
 
 # --- Helper Functions for Data Reading ---
 
+def data_path(filename):
+    """Returns the absolute path of a data file next to this script."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+
+
 def read_json_data(filename='products.json'):
-    """Reads and parses data from a JSON file."""
+    """Reads and parses data from a JSON file (cached until it changes)."""
     try:
-        file_path = os.path.join(os.path.dirname(__file__), filename)
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        return cache.load(data_path(filename), json.load)
     except FileNotFoundError:
         return None
     except json.JSONDecodeError:
@@ -24,24 +30,14 @@ def read_json_data(filename='products.json'):
         return []
 
 def read_csv_data(filename='products.csv'):
-    """Reads and parses data from a CSV file."""
-    data = []
+    """Reads a CSV file into columnar storage (cached until it changes)."""
     try:
-        file_path = os.path.join(os.path.dirname(__file__), filename)
-        with open(file_path, mode='r', newline='') as f:
-            # csv.DictReader maps the rows to dictionaries using the header row as keys
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Convert 'id' and 'price' to appropriate types
-                row['id'] = int(row['id'])
-                row['price'] = float(row['price'])
-                data.append(row)
+        return cache.load(data_path(filename), load_product_columns)
     except FileNotFoundError:
         return None
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return []
-    return data
 
 # --- Main Route ---
 
@@ -57,8 +53,10 @@ def products():
     # 1. Source Validation
     if source == 'json':
         all_products = read_json_data()
+        parser = json.load
     elif source == 'csv':
         all_products = read_csv_data()
+        parser = load_product_columns
     else:
         # Edge Case: Invalid or missing 'source'
         return render_template('product_display.html', error="Wrong source. Must be 'json' or 'csv'.")
@@ -74,23 +72,32 @@ def products():
     if product_id_str:
         try:
             target_id = int(product_id_str)
-            # Filter the list to find the matching product
-            filtered_list = [p for p in all_products if p.get('id') == target_id]
-
-            if not filtered_list:
-                # Edge Case: ID not found
-                return render_template('product_display.html', error=f"Product not found. ID {target_id} does not exist in the {source} data.")
-
-            display_products = filtered_list
-
         except ValueError:
             # Edge Case: Invalid ID format (not an integer)
             return render_template('product_display.html', error="Invalid ID format. ID must be an integer.")
 
+        # Look the product up in the cached id index
+        filename = 'products.json' if source == 'json' else 'products.csv'
+        try:
+            product = cache.index(data_path(filename), parser).get(target_id)
+        except Exception:
+            product = None
+
+        if product is None:
+            # Edge Case: ID not found
+            return render_template('product_display.html', error=f"Product not found. ID {target_id} does not exist in the {source} data.")
+
+        display_products = [product]
+
     # 3. Successful Display
     # Pass the filtered (or full) list of products and the source to the template
     return render_template('product_display.html', products=display_products, source=source)
 
+@app.route('/cache_stats')
+def cache_stats():
+    """Returns the data-source cache hit/miss counters as JSON."""
+    return cache.stats()
+
 # --- Server Execution ---
 
 if __name__ == '__main__':
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+''' Shared Jinja environment setup for the server-side rendering apps '''
+
+
+import os
+from jinja2 import FileSystemBytecodeCache
+
+
+def is_production():
+    """Returns True when APP_ENV is set to 'production'."""
+    return os.environ.get('APP_ENV', 'development') == 'production'
+
+
+def configure_templates(app, cache_dir=None, precompile=True):
+    """Sets up the Jinja environment of a Flask app.
+
+    Compiled templates are stored in a filesystem bytecode cache, so a
+    fresh process can skip parsing. In production, auto-reload is
+    turned off and every template is compiled at startup instead of on
+    its first request.
+
+    Args:
+        app (Flask): application to configure; must not have rendered yet
+        cache_dir (str): bytecode cache directory, defaults to
+            TEMPLATE_CACHE_DIR or a private temp directory
+        precompile (bool): load all templates now when in production
+
+    Returns:
+        list: names of the templates that were precompiled
+    """
+    cache_dir = cache_dir or os.environ.get('TEMPLATE_CACHE_DIR')
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_options = dict(app.jinja_options,
+                             bytecode_cache=FileSystemBytecodeCache(cache_dir))
+
+    if not is_production():
+        return []
+
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    app.jinja_env.auto_reload = False
+    if not precompile:
+        return []
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    return names
@@ -0,0 +1,25 @@
+#!/usr/bin/python3
+"""Basic Auth requests/sec on /basic-protected with and without the cache"""
+import base64
+import sys
+import time
+import task_05_basic_security as api
+
+
+def run(count):
+    client = api.app.test_client()
+    token = base64.b64encode(b"user1:password").decode()
+    headers = {"Authorization": "Basic " + token}
+    start = time.perf_counter()
+    for _ in range(count):
+        res = client.get('/basic-protected', headers=headers)
+        assert res.status_code == 200
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    api.AUTH_CACHE_TTL = 0
+    print("no cache: {:8.1f} requests/sec".format(run(count)))
+    api.AUTH_CACHE_TTL = 30
+    print("cached:   {:8.1f} requests/sec".format(run(count)))
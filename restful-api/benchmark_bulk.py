@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+"""Compares users/sec for /add_user against /users/bulk (JSON and NDJSON)"""
+import json
+import sys
+import time
+from task_04_flask import app, users
+
+
+def timed(label, count, func):
+    users.clear()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    assert len(users) == count, len(users)
+    print("{:<10} {:>8} users in {:6.2f}s ({:>8.0f} users/sec)".format(
+        label, count, elapsed, count / elapsed))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    people = [{"username": "user{}".format(i), "name": "User", "age": 30}
+              for i in range(count)]
+    client = app.test_client()
+
+    timed("single", count,
+          lambda: [client.post('/add_user', json=p) for p in people])
+    timed("bulk json", count,
+          lambda: client.post('/users/bulk', json=people))
+    timed("ndjson", count,
+          lambda: client.post('/users/bulk',
+                              data="\n".join(json.dumps(p) for p in people),
+                              content_type='application/x-ndjson'))
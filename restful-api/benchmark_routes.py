@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+"""Micro-benchmark of SimpleAPIHandler routing: an if/elif chain with
+json.dumps per call vs the pre-encoded route table
+"""
+import json
+import timeit
+from task_03_http_server import SAMPLE_DATA, INFO_DATA, get_response
+
+
+def legacy_get_response(path):
+    """The original routing: an if/elif chain that re-encodes every time"""
+    if path == '/':
+        return (200, 'text/plain',
+                "Hello, this is a simple API!".encode('utf-8'))
+    elif path == '/data':
+        return (200, 'application/json',
+                json.dumps(SAMPLE_DATA).encode('utf-8'))
+    elif path == '/status':
+        return 200, 'text/plain', "OK".encode('utf-8')
+    elif path == '/info':
+        return (200, 'application/json',
+                json.dumps(INFO_DATA).encode('utf-8'))
+    else:
+        return 404, 'text/plain', "Endpoint not found".encode('utf-8')
+
+
+if __name__ == "__main__":
+    paths = ['/', '/data', '/status', '/info', '/nonexistent']
+    number = 200000
+    for name, func in (("if/elif", legacy_get_response),
+                       ("route table", get_response)):
+        seconds = timeit.timeit(lambda: [func(p) for p in paths],
+                                number=number)
+        print("{:<12} {:>10.0f} lookups/sec".format(
+            name, number * len(paths) / seconds))
+    print("No requests are sent; for end-to-end numbers run "
+          "./task_03_http_server.py threaded, then ./load_test.py")
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""Load test for task_03_http_server.py: N concurrent keep-alive clients"""
+import http.client
+import sys
+import threading
+import time
+
+
+def client(host, port, path, count, latencies):
+    """Sends count GET requests over one connection, recording latencies"""
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    for _ in range(count):
+        start = time.perf_counter()
+        conn.request('GET', path)
+        res = conn.getresponse()
+        res.read()
+        if res.getheader('Connection', '').lower() == 'close':
+            conn.close()
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def percentile(sorted_values, pct):
+    """Returns the pct-th percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+def run(host='localhost', port=8000, clients=50, requests=200, path='/data'):
+    """Runs the load test and prints throughput and p50/p99 latency"""
+    latencies = []
+    threads = [threading.Thread(target=client,
+                                args=(host, port, path, requests, latencies))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print("{} requests from {} clients in {:.2f}s ({:.0f} req/s)".format(
+        len(latencies), clients, elapsed, len(latencies) / elapsed))
+    print("p50: {:.2f} ms  p99: {:.2f} ms".format(
+        percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000))
+
+
+if __name__ == "__main__":
+    # Usage: ./load_test.py [port] [clients] [requests_per_client] [path]
+    args = sys.argv[1:]
+    run(port=int(args[0]) if len(args) > 0 else 8000,
+        clients=int(args[1]) if len(args) > 1 else 50,
+        requests=int(args[2]) if len(args) > 2 else 200,
+        path=args[3] if len(args) > 3 else '/data')
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Concurrent stress test for the user stores in user_store.py"""
+import os
+import tempfile
+import threading
+import time
+from user_store import StripedUserStore, SQLiteUserStore
+
+
+def stress(store, threads=16, users_per_thread=2000):
+    """
+    Every thread inserts the same usernames and reads them back, so each
+    username sees `threads` competing inserts. Exactly one must win.
+    """
+    wins = [0] * threads
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(users_per_thread):
+                name = "user{}".format(i)
+                if store.add(name, {"writer": n}):
+                    wins[n] += 1
+                record = store.get(name)
+                if record is None or record["username"] != name:
+                    errors.append(name)
+        except Exception as e:
+            errors.append(repr(e))
+
+    workers = [threading.Thread(target=worker, args=(n,))
+               for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    assert not errors, errors[:5]
+    assert sum(wins) == users_per_thread, sum(wins)
+    assert len(store) == users_per_thread, len(store)
+    assert len(set(store.usernames())) == users_per_thread
+    print("{}: {} ops in {:.2f}s ({:.0f} ops/s)".format(
+        type(store).__name__, 2 * threads * users_per_thread, elapsed,
+        2 * threads * users_per_thread / elapsed))
+
+
+if __name__ == "__main__":
+    stress(StripedUserStore())
+    with tempfile.TemporaryDirectory() as tmp:
+        stress(SQLiteUserStore(os.path.join(tmp, "users.db")),
+               users_per_thread=200)
@@ -1,48 +1,204 @@
 #!/usr/bin/python3
 """Defines function that fetches posts"""
 import csv
+import os
+import secrets
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# the incremental JSON array parser lives with the other serialization
+# helpers in ../python-serialization
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir, "python-serialization"))
+from task_00_basic_serialization import iter_json_items  # noqa: E402
 
-def fetch_and_print_posts():
-    """function fetches and prints"""
-    url = "https://jsonplaceholder.typicode.com/posts"
+POSTS_URL = "https://jsonplaceholder.typicode.com/posts"
+CSV_HEADERS = ['id', 'title', 'body']
+CHUNK_SIZE = 64 * 1024
+
+
+def make_session(retries=3, backoff=0.5, pool_size=10):
+    """
+    Builds a session that reuses connections and retries idempotent
+    requests on connection errors and 429/5xx responses with backoff.
+    """
+    retry = Retry(total=retries, backoff_factor=backoff,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET", "HEAD"))
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size,
+                          pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+session = make_session()
+
+# url -> (etag, last_modified, status_code, content_type, posts)
+_cache = {}
+
+
+def fetch_posts(url=POSTS_URL):
+    """
+    Fetches the posts at url over the shared session.
+    A previously fetched url is revalidated with If-None-Match /
+    If-Modified-Since, and a 304 reuses the cached posts.
+
+    Returns:
+        tuple: (status_code, content_type, posts)
+    """
+    headers = {}
+    cached = _cache.get(url)
+    if cached:
+        if cached[0]:
+            headers["If-None-Match"] = cached[0]
+        if cached[1]:
+            headers["If-Modified-Since"] = cached[1]
+
+    res = session.get(url, headers=headers, timeout=10)
+    if res.status_code == 304 and cached:
+        return cached[2:]
+    res.raise_for_status()  # Raise an exception for HTTP errors
+
+    content_type = res.headers.get("Content-Type")
+    posts = res.json()
+    etag = res.headers.get("ETag")
+    last_modified = res.headers.get("Last-Modified")
+    if etag or last_modified:
+        _cache[url] = (etag, last_modified, res.status_code, content_type,
+                       posts)
+    return res.status_code, content_type, posts
+
+
+def print_posts(status_code, content_type, posts):
+    """prints the status code and post titles"""
+    print("Status Code: {}".format(status_code))
+
+    if content_type == "application/json; charset=utf-8":
+        for post in posts:
+            print(post["title"])
+
+
+def save_posts(posts, csvfile="posts.csv", header=True):
+    """
+    writes the id, title and body of each post to a csv file
+    posts may be any iterable, rows are written as they are produced.
+    The rows go to a temporary file next to csvfile that replaces it
+    only once posts is exhausted, so a failed download leaves an
+    existing csvfile untouched.
+
+    Returns:
+        int: number of rows written
+    """
+    count = 0
+    tmp = os.path.join(os.path.dirname(os.path.abspath(csvfile)),
+                       ".posts_{}.tmp".format(secrets.token_hex(8)))
+    # a fresh name opened with "x" gets the usual umask-based mode
+    file = open(tmp, "x", newline="")
+    try:
+        with file:
+            csv_write = csv.DictWriter(file, fieldnames=CSV_HEADERS,
+                                       extrasaction='ignore')
+            if header:
+                csv_write.writeheader()
+            for post in posts:
+                csv_write.writerow(post)
+                count += 1
+        if os.path.exists(csvfile):
+            shutil.copymode(csvfile, tmp)
+        os.replace(tmp, csvfile)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return count
+
+
+def stream_posts(url=POSTS_URL):
+    """Yields posts from url as the response body arrives"""
+    with session.get(url, stream=True, timeout=10) as res:
+        res.raise_for_status()
+        res.encoding = res.encoding or "utf-8"
+        yield from iter_json_items(
+            res.iter_content(chunk_size=CHUNK_SIZE, decode_unicode=True))
+
+
+def page_urls(url=POSTS_URL, pages=10, param="_page"):
+    """Builds the urls of pages 1..pages of a page-numbered endpoint"""
+    sep = "&" if "?" in url else "?"
+    return ["{}{}{}={}".format(url, sep, param, n)
+            for n in range(1, pages + 1)]
+
+
+def fetch_pages_to_csv(urls, csvfile="posts.csv", workers=4):
+    """
+    Streams several endpoints (e.g. from page_urls) in parallel into one
+    csv file. Each url is written to its own part file as it downloads,
+    then the parts are joined in url order.
+
+    Returns:
+        int: number of rows written
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        parts = [os.path.join(tmp, "part_{}.csv".format(n))
+                 for n in range(len(urls))]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(
+                lambda job: save_posts(stream_posts(job[0]), job[1],
+                                       header=False),
+                zip(urls, parts)))
+
+        with open(csvfile, "w", newline="") as out:
+            csv.writer(out).writerow(CSV_HEADERS)
+            for part in parts:
+                with open(part, newline="") as f:
+                    shutil.copyfileobj(f, out)
+    return sum(counts)
 
+
+def fetch_and_print_posts(url=POSTS_URL):
+    """function fetches and prints"""
     try:
-        res = requests.get(url)
-        res.raise_for_status()  # Raise an exception for HTTP errors
+        status_code, content_type, posts = fetch_posts(url)
     except requests.RequestException as e:
         print(f"Failed to retrieve data: {e}")
         return
 
-    print("Status Code: {}".format(res.status_code))
+    print_posts(status_code, content_type, posts)
 
-    if res.headers.get("Content-Type") == "application/json; charset=utf-8":
-        json_data = res.json()
-        for post in json_data:
-            print(post["title"])
 
-def fetch_and_save_posts():
+def fetch_and_save_posts(url=POSTS_URL, csvfile="posts.csv"):
     """
     Fetches all posts from JSONPlaceholder and saves them in a csv file.
+    Rows are written while the response streams in, unless the posts are
+    already cached from an earlier fetch of the same url.
     """
-    url = "https://jsonplaceholder.typicode.com/posts"
-
     try:
-        res = requests.get(url)
-    except:
+        if url in _cache:
+            _, _, posts = fetch_posts(url)
+        else:
+            posts = stream_posts(url)
+        save_posts(posts, csvfile)
+    except (requests.RequestException, ValueError):
         print("Failed to retrieve data")
         return
 
-    json_data = res.json()
-
-    csvfile = "posts.csv"
-
-    filtered_data = [{key: post[key] for key in ('id', 'title', 'body')} for post in json_data]
 
-    headers = ['id', 'title', 'body']
+def fetch_print_and_save_posts(url=POSTS_URL, csvfile="posts.csv"):
+    """
+    Fetches the posts once and feeds the same data to both the printer
+    and the csv writer.
+    """
+    try:
+        status_code, content_type, posts = fetch_posts(url)
+    except (requests.RequestException, ValueError) as e:
+        print(f"Failed to retrieve data: {e}")
+        return
 
-    with open(csvfile, "w", newline="") as file:
-        csv_write = csv.DictWriter(file, fieldnames=headers)
-        csv_write.writeheader()
-        csv_write.writerows(filtered_data)
+    print_posts(status_code, content_type, posts)
+    save_posts(posts, csvfile)
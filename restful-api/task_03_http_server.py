@@ -1,93 +1,245 @@
+import asyncio
 import http.server
 import socketserver
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Define the port the server will listen on
 PORT = 8000
 
+# Worker threads used by the threaded server mode
+WORKERS = 16
+
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 5
+
 # Sample JSON data to be served on the /data endpoint
 SAMPLE_DATA = {"name": "John", "age": 30, "city": "New York"}
 
 # Additional data for the /info endpoint (as mentioned in the expected output)
-INFO_DATA = {"version": "1.0", "description": "A simple API built with http.server"}
+INFO_DATA = {"version": "1.0",
+             "description": "A simple API built with http.server"}
+
+
+def _text(message, status_code=200):
+    """Builds a plain-text response tuple, encoded once."""
+    return status_code, 'text/plain', message.encode('utf-8')
+
+
+def _json(data, status_code=200):
+    """Builds a JSON response tuple, serialized and encoded once."""
+    return status_code, 'application/json', json.dumps(data).encode('utf-8')
+
+
+# Exact-match routes, mapped straight to (status_code, content_type, body)
+# tuples built at startup since SAMPLE_DATA and INFO_DATA never change
+ROUTES = {
+    # 1. Root path: http://localhost:8000/
+    '/': _text("Hello, this is a simple API!"),
+    # 2. Data path: http://localhost:8000/data
+    '/data': _json(SAMPLE_DATA),
+    # 3. Status path: http://localhost:8000/status
+    '/status': _text("OK"),
+    # 4. Info path: http://localhost:8000/info
+    '/info': _json(INFO_DATA),
+}
+
+# 5. Error handling: Undefined endpoints
+NOT_FOUND = _text("Endpoint not found", 404)
+
+# Parameterized routes: /data/<field> returns a single field of SAMPLE_DATA
+DATA_FIELDS = {key: _json({key: value}) for key, value in SAMPLE_DATA.items()}
+PREFIX_ROUTES = {
+    '/data/': DATA_FIELDS.get,
+}
+
+
+def get_response(path):
+    """
+    Routes a request path to its response.
+    Returns a (status_code, content_type, body_bytes) tuple.
+    """
+    # Ignore any query string
+    path = path.split('?', 1)[0]
+    response = ROUTES.get(path)
+    if response is not None:
+        return response
+
+    # /prefix/param: look up the handler for everything up to the last '/'
+    prefix, _, param = path.rpartition('/')
+    handler = PREFIX_ROUTES.get(prefix + '/')
+    if handler is not None and param:
+        response = handler(param)
+    return response or NOT_FOUND
+
 
 class SimpleAPIHandler(http.server.BaseHTTPRequestHandler):
     """
     A custom request handler for our simple API.
     It overrides the do_GET method to handle GET requests.
+    Speaks HTTP/1.1 so clients can keep the connection open between requests.
     """
 
-    def _set_headers(self, status_code=200, content_type='text/html'):
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits on the client's delayed ACK on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def _set_headers(self, status_code=200, content_type='text/html',
+                     content_length=0):
         """Sets the common response headers."""
         self.send_response(status_code)
         self.send_header('Content-type', content_type)
+        # A known length lets the client reuse the connection
+        self.send_header('Content-Length', str(content_length))
         self.end_headers()
 
     def do_GET(self):
         """
-        Handles GET requests and routes them based on the request path (self.path).
+        Handles GET requests and routes them based on the request path
+        (self.path).
         """
-        # 1. Root path: http://localhost:8000/
-        if self.path == '/':
-            message = "Hello, this is a simple API!"
-            self._set_headers(content_type='text/plain')
-            self.wfile.write(message.encode('utf-8'))
-        
-        # 2. Data path: http://localhost:8000/data
-        elif self.path == '/data':
-            # Convert Python dictionary to a JSON string
-            response_data = json.dumps(SAMPLE_DATA)
-            
-            # Set headers for JSON response
-            self._set_headers(content_type='application/json')
-            
-            # Write the JSON string as bytes to the response body
-            self.wfile.write(response_data.encode('utf-8'))
-
-        # 3. Status path: http://localhost:8000/status
-        elif self.path == '/status':
-            message = "OK"
-            self._set_headers(content_type='text/plain')
-            self.wfile.write(message.encode('utf-8'))
-
-        # 4. Info path: http://localhost:8000/info
-        # Added to match the expected output requirements
-        elif self.path == '/info':
-            response_data = json.dumps(INFO_DATA)
-            self._set_headers(content_type='application/json')
-            self.wfile.write(response_data.encode('utf-8'))
-
-        # 5. Error handling: Undefined endpoints
-        else:
-            message = "Endpoint not found"
-            # Set a 404 Not Found status code
-            self._set_headers(status_code=404, content_type='text/plain')
-            self.wfile.write(message.encode('utf-8'))
+        status_code, content_type, body = get_response(self.path)
+        self._set_headers(status_code, content_type, len(body))
+        self.wfile.write(body)
+
+
+class SingleAPIHandler(SimpleAPIHandler):
+    """
+    HTTP/1.0 variant for the single-threaded server, where a client idling
+    on a keep-alive connection would block everyone else.
+    """
+
+    protocol_version = 'HTTP/1.0'
+
+
+class PooledHTTPServer(http.server.ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that hands connections to a fixed-size thread pool
+    instead of starting a new thread for every one.
+    """
+
+    # TCPServer's default listen backlog of 5 overflows as soon as a few
+    # dozen clients connect at once, and the kernel then drops SYNs that
+    # are only retried after a second
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers=WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread,
+                             request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
+async def handle_async_client(reader, writer):
+    """
+    Serves GET requests on one connection for the asyncio server mode,
+    keeping it open between requests unless the client asks otherwise.
+    """
+    try:
+        while True:
+            request_line = await asyncio.wait_for(reader.readline(),
+                                                  KEEP_ALIVE_TIMEOUT)
+            if not request_line:
+                break
+            method, path, version = request_line.decode('latin-1').split()
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip().lower()
+
+            if method == 'GET':
+                status_code, content_type, body = get_response(path)
+            else:
+                status_code, content_type, body = (
+                    501, 'text/plain', b"Unsupported method")
+
+            connection = headers.get('connection', '')
+            keep_alive = (connection == 'keep-alive' or
+                          (version == 'HTTP/1.1' and connection != 'close'))
+
+            writer.write((
+                "HTTP/1.1 {} {}\r\n"
+                "Content-type: {}\r\n"
+                "Content-Length: {}\r\n"
+                "Connection: {}\r\n\r\n"
+            ).format(status_code, http.HTTPStatus(status_code).phrase,
+                     content_type, len(body),
+                     'keep-alive' if keep_alive else 'close'
+                     ).encode('latin-1') + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.TimeoutError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_async(port=PORT):
+    """Runs the asyncio-based server until cancelled."""
+    server = await asyncio.start_server(handle_async_client, '', port)
+    async with server:
+        await server.serve_forever()
+
 
 # --- Server Setup ---
 
-def run_server():
+def run_server(mode='single', port=PORT, workers=WORKERS):
     """
     Sets up and starts the HTTP server.
+
+    mode selects how requests are served:
+        'single'   - one request at a time (socketserver.TCPServer)
+        'threaded' - a pool of `workers` threads (PooledHTTPServer)
+        'async'    - a single asyncio event loop
     """
-    # socketserver.TCPServer handles socket creation and binds to address/port
-    # SimpleAPIHandler is passed to handle all incoming requests
-    with socketserver.TCPServer(("", PORT), SimpleAPIHandler) as httpd:
-        print(f"✅ Serving on port {PORT}")
-        print(f"Try: http://localhost:{PORT}")
-        print(f"Try: http://localhost:{PORT}/data")
-        print(f"Try: http://localhost:{PORT}/status")
-        print(f"Try: http://localhost:{PORT}/info")
-        print(f"Try: http://localhost:{PORT}/nonexistent")
-        
+    print(f"✅ Serving on port {port} ({mode} mode)")
+    print(f"Try: http://localhost:{port}")
+    print(f"Try: http://localhost:{port}/data")
+    print(f"Try: http://localhost:{port}/status")
+    print(f"Try: http://localhost:{port}/info")
+    print(f"Try: http://localhost:{port}/nonexistent")
+
+    if mode == 'async':
+        try:
+            asyncio.run(serve_async(port))
+        except KeyboardInterrupt:
+            print("\n🛑 Server stopped by user.")
+        return
+
+    if mode == 'threaded':
+        httpd = PooledHTTPServer(("", port), SimpleAPIHandler, workers)
+    elif mode == 'single':
+        # socketserver.TCPServer handles socket creation and binds to
+        # address/port; SingleAPIHandler handles all incoming requests
+        httpd = socketserver.TCPServer(("", port), SingleAPIHandler)
+    else:
+        raise ValueError(f"Unknown server mode: {mode}")
+
+    with httpd:
         try:
             # Start the server and keep it running indefinitely
             httpd.serve_forever()
         except KeyboardInterrupt:
             # Handle graceful shutdown on Ctrl+C
             print("\n🛑 Server stopped by user.")
-            httpd.shutdown()
+
 
 if __name__ == "__main__":
     # Ensure the script runs the server when executed directly
-    run_server()
+    # Usage: ./task_03_http_server.py [single|threaded|async] [port]
+    run_server(sys.argv[1] if len(sys.argv) > 1 else 'single',
+               int(sys.argv[2]) if len(sys.argv) > 2 else PORT)
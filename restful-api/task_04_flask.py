@@ -1,12 +1,25 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 import json
+import os
 from werkzeug.exceptions import BadRequest
+from user_store import StripedUserStore, SQLiteUserStore
 
 # 1. Instantiate the Flask application
 app = Flask(__name__)
 
-# Dictionary to store user data in memory. This starts empty for the checker.
-users = {}
+
+def make_user_store():
+    """
+    Picks the user store from the USER_STORE environment variable:
+    'memory' (default) or 'sqlite', which persists to USER_DB.
+    """
+    if os.environ.get('USER_STORE', 'memory') == 'sqlite':
+        return SQLiteUserStore(os.environ.get('USER_DB', 'users.db'))
+    return StripedUserStore()
+
+
+# Store for user data. The in-memory default starts empty for the checker.
+users = make_user_store()
 
 # --- API Endpoints ---
 
@@ -22,11 +35,36 @@ def get_status():
     return "OK"
 
 # 3. Data Endpoint
+DATA_PAGE_LIMIT = 1000
+
+
 @app.route('/data', methods=['GET'])
 def get_data():
-    """Returns a JSON list of all usernames."""
-    # Return the list of keys (usernames) from the users dictionary as JSON
-    return jsonify(list(users.keys()))
+    """
+    Returns a JSON list of all usernames.
+
+    Large user sets can be read without building the whole list:
+      ?limit=N[&cursor=C]  one page as {"usernames": [...], "next_cursor": C}
+      ?format=ndjson       every username streamed as one JSON string per line
+    """
+    if request.args.get('format') == 'ndjson':
+        lines = (json.dumps(name) + "\n" for name in users.usernames())
+        return Response(stream_with_context(lines),
+                        mimetype='application/x-ndjson')
+
+    if 'limit' in request.args or 'cursor' in request.args:
+        try:
+            limit = int(request.args.get('limit', DATA_PAGE_LIMIT))
+            if limit < 1:
+                raise ValueError(limit)
+            names, next_cursor = users.page(request.args.get('cursor'),
+                                            min(limit, DATA_PAGE_LIMIT))
+        except ValueError:
+            return jsonify({"error": "Invalid limit or cursor"}), 400
+        return jsonify({"usernames": names, "next_cursor": next_cursor})
+
+    # Return the list of usernames from the user store as JSON
+    return jsonify(list(users.usernames()))
 
 # 4. Dynamic User Endpoint
 @app.route('/users/<username>', methods=['GET'])
@@ -35,13 +73,11 @@ def get_user(username):
     Returns the full object for a specific username.
     Returns 404 if the user is not found.
     """
-    # Check if the username exists in the dictionary
-    if username in users:
-        # Return the user's data as JSON
-        # Ensure the returned object contains 'username' as specified in the POST response
-        user_data = users[username].copy()
-        user_data['username'] = username
-        return jsonify(user_data)
+    # The store keeps each record pre-encoded, with 'username' included
+    # as in the POST response, so it can be sent back without copying
+    user_json = users.get_json(username)
+    if user_json is not None:
+        return app.response_class(user_json, mimetype='application/json')
     else:
         # Return a 404 Not Found response with a custom JSON body
         return jsonify({"error": "User not found"}), 404
@@ -79,30 +115,99 @@ def add_user():
     username = new_user_data['username']
 
     # Validation 2: Check for duplicate username
-    if username in users:
+    # The check and the insert happen atomically inside the store
+    if not users.add(username, new_user_data):
         return jsonify({"error": "Username already exists"}), 409
 
-    # Add the user to the in-memory dictionary
-    # We store a copy of the incoming data
-    # Note: We ensure the username is the dictionary key, but we don't need to store
-    # 'username' redundantly *inside* the user object itself unless it was provided.
-    users[username] = new_user_data.copy()
-
-    # Create the final response payload, ensuring 'username' is included in the 'user' object
-    response_user_data = users[username].copy()
-    response_user_data['username'] = username
-    
     response = {
         "message": "User added",
-        "user": response_user_data
+        "user": dict(new_user_data, username=username)
     }
 
     # Return the confirmation message with HTTP status code 201 (Created)
     return jsonify(response), 201
 
 
+# 6. Bulk import Endpoint
+BULK_CHUNK_SIZE = 1000
+
+
+def _bulk_items():
+    """
+    Yields (index, item, error) for each user in the request body.
+    The body is either a JSON array or NDJSON (one object per line),
+    which is read line by line so large uploads are never held whole.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        index = 0
+        for line in request.stream:
+            if not line.strip():
+                continue
+            try:
+                yield index, json.loads(line), None
+            except ValueError:
+                yield index, None, "Invalid JSON"
+            index += 1
+        return
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        raise BadRequest("Expected a JSON array or NDJSON body")
+    for index, item in enumerate(data):
+        yield index, item, None
+
+
+@app.route('/users/bulk', methods=['POST'])
+def add_users_bulk():
+    """
+    Adds many users in one request.
+    Each item is validated like in /add_user. Invalid or duplicate items
+    are reported by their position and do not stop the rest of the import.
+    """
+    added = 0
+    errors = []
+    chunk = []
+
+    def flush():
+        nonlocal added
+        results = users.add_many((name, record) for _, name, record in chunk)
+        for (index, name, _), ok in zip(chunk, results):
+            if ok:
+                added += 1
+            else:
+                errors.append({"index": index,
+                               "error": "Username already exists"})
+        chunk.clear()
+
+    try:
+        for index, item, error in _bulk_items():
+            if error is None and not isinstance(item, dict):
+                error = "Invalid JSON"
+            elif error is None and 'username' not in item:
+                error = "Username is required"
+            elif error is None and not isinstance(item['username'], str):
+                error = "Username must be a string"
+            if error is not None:
+                errors.append({"index": index, "error": error})
+                continue
+            chunk.append((index, item['username'], item))
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                flush()
+        flush()
+    except BadRequest:
+        return jsonify({"error": "Invalid JSON"}), 400
+
+    errors.sort(key=lambda e: e["index"])
+    return jsonify({
+        "message": "Bulk import finished",
+        "added": added,
+        "failed": len(errors),
+        "errors": errors
+    }), 201 if added else 200
+
+
 # --- Running the Server ---
 if __name__ == "__main__":
-    # IMPORTANT: The users dictionary is NOT populated here. 
+    # IMPORTANT: The user store is NOT populated here. 
     # It remains empty for the checker to test from a clean state.
     app.run(debug=True)
@@ -1,36 +1,207 @@
 #!/usr/bin/python3
 
 
-from flask import Flask, jsonify, request
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from flask import Flask, g, jsonify, request
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_httpauth import HTTPBasicAuth
 from flask_jwt_extended import (JWTManager, create_access_token,
-                                jwt_required, get_jwt_identity)
+                                decode_token, jwt_required, get_jwt)
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import ExpiredSignatureError, InvalidTokenError
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your_secret_key_here'
 auth = HTTPBasicAuth()
 jwt = JWTManager(app)
 
+# Hash cost, e.g. "pbkdf2:sha256:600000" or "scrypt:32768:8:1";
+# empty means werkzeug's default
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', '')
+# Seconds a successful password check is remembered (0 disables the cache)
+AUTH_CACHE_TTL = float(os.environ.get('AUTH_CACHE_TTL', '30'))
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+# Processes used for hashing (0 hashes in the request thread)
+HASH_WORKERS = int(os.environ.get('HASH_WORKERS', '0'))
+# Verified JWTs kept so repeat requests skip signature checks
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '1024'))
+# Seconds between sweeps of expired entries from the revocation list
+REVOKED_SWEEP_INTERVAL = 60
 
-users = {
-    "user1": {
-        "username": "user1",
-        "password": generate_password_hash("password"),
-        "role": "user"
-    },
-    "admin1": {
-        "username": "admin1",
-        "password": generate_password_hash("password"),
-        "role": "admin"
-    }
+# Per-process key so cached entries never hold anything derived from a
+# password that could be checked offline
+_auth_cache_key = secrets.token_bytes(32)
+_auth_cache = OrderedDict()
+_auth_cache_lock = threading.Lock()
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def _run_hash(func, *args):
+    """Runs a hashing function, in the process pool if one is configured."""
+    global _hash_pool
+    if not HASH_WORKERS:
+        return func(*args)
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+    return _hash_pool.submit(func, *args).result()
+
+
+def hash_password(password):
+    if PASSWORD_HASH_METHOD:
+        return _run_hash(generate_password_hash, password,
+                         PASSWORD_HASH_METHOD)
+    return _run_hash(generate_password_hash, password)
+
+
+def check_password(user, password):
+    """
+    Checks a password against the user's stored hash.
+    Successful checks are cached briefly under a keyed hash of the
+    username, password and stored hash, so repeated Basic Auth requests
+    skip the slow hash and a password change invalidates the entry.
+    """
+    if password is None:
+        return False
+    key = hmac.new(_auth_cache_key, "\0".join(
+        (user['username'], password, user['password'])).encode('utf-8'),
+        hashlib.sha256).digest()
+    now = time.monotonic()
+
+    with _auth_cache_lock:
+        expires = _auth_cache.get(key)
+        if expires is not None:
+            if expires > now:
+                _auth_cache.move_to_end(key)
+                return True
+            del _auth_cache[key]
+
+    if not _run_hash(check_password_hash, user['password'], password):
+        return False
+
+    if AUTH_CACHE_TTL > 0:
+        with _auth_cache_lock:
+            _auth_cache[key] = now + AUTH_CACHE_TTL
+            while len(_auth_cache) > AUTH_CACHE_SIZE:
+                _auth_cache.popitem(last=False)
+    return True
+
+
+# Seed users are hashed on first use rather than at import time
+SEED_USERS = {
+    "user1": ("password", "user"),
+    "admin1": ("password", "admin"),
 }
+users = {}
+_users_lock = threading.Lock()
+
+
+def get_user(username):
+    """Returns the user record, hashing a seed user's password on first use."""
+    user = users.get(username)
+    if user is None and username in SEED_USERS:
+        with _users_lock:
+            user = users.get(username)
+            if user is None:
+                password, role = SEED_USERS[username]
+                user = {
+                    "username": username,
+                    "password": hash_password(password),
+                    "role": role
+                }
+                users[username] = user
+    return user
+
+
+# Revoked token ids (jti) mapped to the token's expiry time. An entry is
+# only needed until the token would have expired anyway.
+_revoked = {}
+_revoked_lock = threading.Lock()
+_next_sweep = 0
+
+
+def revoke_token(jti, expires):
+    global _next_sweep
+    now = time.time()
+    with _revoked_lock:
+        _revoked[jti] = expires
+        if now >= _next_sweep:
+            for old_jti in [j for j, exp in _revoked.items() if exp <= now]:
+                del _revoked[old_jti]
+            _next_sweep = now + REVOKED_SWEEP_INTERVAL
+
+
+def is_revoked(jti):
+    return jti in _revoked
+
+
+@jwt.token_in_blocklist_loader
+def check_if_token_revoked(jwt_header, jwt_payload):
+    return is_revoked(jwt_payload['jti'])
+
+
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def cached_jwt_required(view):
+    """
+    Like jwt_required(), but remembers verified tokens in a bounded LRU
+    so a repeated token skips decoding and signature checks. Expiry and
+    revocation are still checked on every request. The claims are
+    available as g.jwt_claims.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return handle_unauthorized_error(None)
+        token = header[7:]
+        key = hashlib.sha256(token.encode('utf-8')).digest()
+
+        with _token_cache_lock:
+            claims = _token_cache.get(key)
+            if claims is not None:
+                _token_cache.move_to_end(key)
+        if claims is None:
+            try:
+                claims = decode_token(token)
+            except ExpiredSignatureError:
+                return handle_expired_token_error(None, None)
+            except (InvalidTokenError, JWTExtendedException, ValueError) as e:
+                return handle_invalid_token_error(str(e))
+            # only access tokens are accepted, as with jwt_required()
+            if claims.get('type') != 'access':
+                return handle_invalid_token_error("Only access tokens are "
+                                                  "allowed")
+            with _token_cache_lock:
+                _token_cache[key] = claims
+                while len(_token_cache) > TOKEN_CACHE_SIZE:
+                    _token_cache.popitem(last=False)
+
+        if claims.get('exp', float('inf')) <= time.time():
+            return handle_expired_token_error(None, claims)
+        if is_revoked(claims['jti']):
+            return handle_revoked_token_error(None, claims)
+        g.jwt_claims = claims
+        return view(*args, **kwargs)
+    return wrapper
 
 
 @auth.verify_password
 def verify_password(username, password):
-    user = users.get(username)
-    if user and check_password_hash(user['password'], password):
+    user = get_user(username)
+    if user and check_password(user, password):
         return user
     return None
 
@@ -46,25 +217,32 @@ def login():
     data = request.get_json()
     username = data.get('username')
     password = data.get('password')
-    user = users.get(username)
-    if user and check_password_hash(user['password'], password):
-        access_token = create_access_token(identity={'username': username,
-                                                     'role': user['role']})
+    user = get_user(username)
+    if user and check_password(user, password):
+        access_token = create_access_token(
+            identity=username, additional_claims={'role': user['role']})
         return jsonify(access_token=access_token)
     return jsonify({"error": "Invalid credentials"}), 401
 
 
-@app.route('/jwt-protected')
+@app.route('/logout', methods=['POST'])
 @jwt_required()
+def logout():
+    claims = get_jwt()
+    revoke_token(claims['jti'], claims.get('exp', float('inf')))
+    return jsonify({"message": "Token revoked"})
+
+
+@app.route('/jwt-protected')
+@cached_jwt_required
 def jwt_protected():
     return "JWT Auth: Access Granted"
 
 
 @app.route('/admin-only')
-@jwt_required()
+@cached_jwt_required
 def admin_only():
-    current_user = get_jwt_identity()
-    if current_user['role'] != 'admin':
+    if g.jwt_claims.get('role') != 'admin':
         return jsonify({"error": "Admin access required"}), 403
     return "Admin Access: Granted"
 
@@ -80,17 +258,17 @@ def handle_invalid_token_error(err):
 
 
 @jwt.expired_token_loader
-def handle_expired_token_error(err):
+def handle_expired_token_error(jwt_header, jwt_payload):
     return jsonify({"error": "Token has expired"}), 401
 
 
 @jwt.revoked_token_loader
-def handle_revoked_token_error(err):
+def handle_revoked_token_error(jwt_header, jwt_payload):
     return jsonify({"error": "Token has been revoked"}), 401
 
 
 @jwt.needs_fresh_token_loader
-def handle_needs_fresh_token_error(err):
+def handle_needs_fresh_token_error(jwt_header, jwt_payload):
     return jsonify({"error": "Fresh token required"}), 401
 
 
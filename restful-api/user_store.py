@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""User stores for task_04_flask.py: in-memory (lock-striped) and SQLite"""
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from itertools import islice
+from types import MappingProxyType
+
+
+class UserStore(ABC):
+    """
+    Interface shared by the user stores.
+
+    Records are dicts that always contain 'username'. Once added they are
+    never mutated, so readers get them without copying.
+    """
+
+    @abstractmethod
+    def add(self, username, record):
+        """Stores record under username. Returns False if it already exists."""
+
+    def add_many(self, items):
+        """
+        Stores (username, record) pairs in one pass.
+        Returns a list of booleans, one per pair, as add() would.
+        """
+        return [self.add(username, record) for username, record in items]
+
+    @abstractmethod
+    def get(self, username):
+        """Returns a read-only view of the record, or None."""
+
+    @abstractmethod
+    def get_json(self, username):
+        """Returns the record already encoded as JSON bytes, or None."""
+
+    @abstractmethod
+    def usernames(self):
+        """Iterates over usernames in insertion order."""
+
+    @abstractmethod
+    def page(self, cursor=None, limit=100):
+        """
+        Returns (usernames, next_cursor) for up to limit usernames after
+        cursor, an opaque string from a previous call (None to start).
+        next_cursor is None on the last page.
+        Raises ValueError for a malformed cursor.
+        """
+
+    @abstractmethod
+    def __len__(self):
+        """Returns the number of stored users."""
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+
+class StripedUserStore(UserStore):
+    """
+    In-memory store split into independently locked stripes.
+
+    Writers only lock the stripe that owns the username, so unrelated
+    inserts do not contend. Readers take no lock: records are immutable
+    views and a single dict lookup is atomic.
+    """
+
+    def __init__(self, stripes=16):
+        self._stripes = [({}, threading.Lock()) for _ in range(stripes)]
+        self._order = []
+
+    def _stripe(self, username):
+        return self._stripes[hash(username) % len(self._stripes)]
+
+    def add(self, username, record):
+        record = dict(record, username=username)
+        entry = (MappingProxyType(record), json.dumps(record).encode('utf-8'))
+        table, lock = self._stripe(username)
+        with lock:
+            if username in table:
+                return False
+            table[username] = entry
+            self._order.append(username)
+        return True
+
+    def _entry(self, username):
+        return self._stripe(username)[0].get(username)
+
+    def get(self, username):
+        entry = self._entry(username)
+        return entry[0] if entry else None
+
+    def get_json(self, username):
+        entry = self._entry(username)
+        return entry[1] if entry else None
+
+    def usernames(self):
+        # _order is append-only, so walk it in place instead of copying
+        return islice(self._order, len(self._order))
+
+    def page(self, cursor=None, limit=100):
+        start = int(cursor) if cursor else 0
+        if start < 0:
+            raise ValueError(cursor)
+        names = self._order[start:start + limit]
+        end = start + len(names)
+        return names, str(end) if end < len(self._order) else None
+
+    def __len__(self):
+        return len(self._order)
+
+    def clear(self):
+        for table, lock in self._stripes:
+            with lock:
+                table.clear()
+        self._order.clear()
+
+
+class SQLiteUserStore(UserStore):
+    """
+    Persistent store backed by SQLite, one connection per thread.
+
+    The record JSON is stored as-is, so get_json needs no re-encoding.
+    """
+
+    def __init__(self, path='users.db'):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript('''
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS users (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL UNIQUE,
+                data TEXT NOT NULL
+            );
+        ''')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30,
+                                   isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def add(self, username, record):
+        data = json.dumps(dict(record, username=username))
+        cur = self._conn().execute(
+            'INSERT OR IGNORE INTO users (username, data) VALUES (?, ?)',
+            (username, data))
+        return cur.rowcount == 1
+
+    def add_many(self, items):
+        """Inserts all pairs in a single transaction."""
+        conn = self._conn()
+        results = []
+        conn.execute('BEGIN')
+        try:
+            for username, record in items:
+                cur = conn.execute(
+                    'INSERT OR IGNORE INTO users (username, data) '
+                    'VALUES (?, ?)',
+                    (username, json.dumps(dict(record, username=username))))
+                results.append(cur.rowcount == 1)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return results
+
+    def get_json(self, username):
+        row = self._conn().execute(
+            'SELECT data FROM users WHERE username = ?',
+            (username,)).fetchone()
+        return row[0].encode('utf-8') if row else None
+
+    def get(self, username):
+        data = self.get_json(username)
+        return MappingProxyType(json.loads(data)) if data else None
+
+    def usernames(self):
+        for row in self._conn().execute(
+                'SELECT username FROM users ORDER BY seq'):
+            yield row[0]
+
+    def page(self, cursor=None, limit=100):
+        after = int(cursor) if cursor else 0
+        rows = self._conn().execute(
+            'SELECT seq, username FROM users WHERE seq > ? '
+            'ORDER BY seq LIMIT ?', (after, limit + 1)).fetchall()
+        names = [row[1] for row in rows[:limit]]
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+        return names, next_cursor
+
+    def __len__(self):
+        return self._conn().execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+    def clear(self):
+        self._conn().execute('DELETE FROM users')